@@ -0,0 +1,184 @@
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from analytics.dates import add_months
+
+
+class MemoryBackend:
+    """In-process LRU with a per-entry TTL. Only visible to one worker."""
+
+    def __init__(self, maxsize=512, ttl=300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.time() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, namespace=None, user_id=None, year=None, month=None):
+        """Drop every entry matching the given key parts (None matches anything)"""
+        with self._lock:
+            for key in [k for k in self._entries if _matches(k, namespace, user_id, year, month)]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLiteBackend:
+    """Cache stored in a local SQLite file, shared by every worker on the box"""
+
+    def __init__(self, path, ttl=300):
+        self.path = path
+        self.ttl = ttl
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS result_cache ('
+                ' namespace TEXT NOT NULL, user_id INTEGER NOT NULL,'
+                ' year INTEGER NOT NULL, month INTEGER NOT NULL,'
+                ' expires REAL NOT NULL, value BLOB NOT NULL,'
+                ' PRIMARY KEY (namespace, user_id, year, month))'
+            )
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=5)
+        try:
+            with conn:  # commits on success
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, key):
+        with self._connect() as conn:
+            row = conn.execute(
+                'SELECT expires, value FROM result_cache'
+                ' WHERE namespace = ? AND user_id = ? AND year = ? AND month = ?',
+                key
+            ).fetchone()
+        if row is None or row[0] < time.time():
+            return None
+        return pickle.loads(row[1])
+
+    def set(self, key, value):
+        with self._connect() as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO result_cache VALUES (?, ?, ?, ?, ?, ?)',
+                (*key, time.time() + self.ttl, pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+            )
+
+    def delete(self, namespace=None, user_id=None, year=None, month=None):
+        clauses, params = [], []
+        for column, value in (('namespace', namespace), ('user_id', user_id),
+                              ('year', year), ('month', month)):
+            if value is not None:
+                clauses.append(f'{column} = ?')
+                params.append(value)
+        where = ' WHERE ' + ' AND '.join(clauses) if clauses else ''
+        with self._connect() as conn:
+            conn.execute(f'DELETE FROM result_cache{where}', params)
+
+    def clear(self):
+        self.delete()
+
+
+def _matches(key, namespace, user_id, year, month):
+    return all(
+        wanted is None or part == wanted
+        for part, wanted in zip(key, (namespace, user_id, year, month))
+    )
+
+
+class ResultCache:
+    """Per-user cache of computed dashboard / monthly-report payloads.
+
+    Keys are (namespace, user_id, year, month). Writes invalidate through
+    invalidate_user(): a change to one month drops that month's report, the
+    next month's (its spending change compares against this month) and
+    all of the user's dashboards (they include all-time and trailing
+    figures); a change with no month (budgets, categories) drops
+    everything for the user.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get_or_compute(self, namespace, user_id, year, month, compute):
+        key = (namespace, user_id, year, month)
+        try:
+            value = self.backend.get(key)
+        except Exception as e:
+            print(f"⚠️ Cache read failed: {e}")
+            value = None
+
+        if value is not None:
+            self.hits += 1
+            return value
+
+        self.misses += 1
+        value = compute()
+        try:
+            self.backend.set(key, value)
+        except Exception as e:
+            print(f"⚠️ Cache write failed: {e}")
+        return value
+
+    def invalidate_user(self, user_id, year=None, month=None):
+        self.invalidations += 1
+        if year is not None and month is not None:
+            self.backend.delete('monthly_report', user_id, year, month)
+            self.backend.delete('monthly_report', user_id, *add_months(year, month, 1))
+            self.backend.delete('dashboard', user_id)
+        else:
+            self.backend.delete(user_id=user_id)
+
+    def invalidate_all(self):
+        self.invalidations += 1
+        self.backend.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'backend': type(self.backend).__name__,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+            'invalidations': self.invalidations
+        }
+
+
+def create_cache(config):
+    """Build the cache configured by RESULT_CACHE_BACKEND ('memory' or 'sqlite')"""
+    ttl = config.get('RESULT_CACHE_TTL', 300)
+    if config.get('RESULT_CACHE_BACKEND', 'memory') == 'sqlite':
+        backend = SQLiteBackend(config.get('RESULT_CACHE_PATH', 'instance/result_cache.sqlite3'), ttl)
+    else:
+        backend = MemoryBackend(config.get('RESULT_CACHE_SIZE', 512), ttl)
+    return ResultCache(backend)
@@ -0,0 +1,73 @@
+from sqlalchemy import func, case, and_
+from models import db, MonthlyCategoryTotal
+
+
+class DashboardAggregator:
+    """Every total the dashboard needs for one month, in two grouped queries.
+
+    Both queries read the monthly rollup, so their cost depends on the
+    number of months and categories, not on how many transactions the
+    user has. Query 1 groups by type and returns both the all-time sum
+    (for net worth) and the selected month's sum (income / expenses).
+    Query 2 groups the month's debits by category. Everything the template
+    shows is then assembled from those rows in memory.
+    """
+
+    def __init__(self, user_id, year, month):
+        self.user_id = user_id
+        self.year = year
+        self.month = month
+
+    def totals(self):
+        rollup = MonthlyCategoryTotal
+        in_month = and_(rollup.year == self.year, rollup.month == self.month)
+
+        by_type = db.session.query(
+            rollup.type,
+            func.sum(rollup.total),
+            func.sum(case((in_month, rollup.total), else_=0))
+        ).filter(
+            rollup.user_id == self.user_id
+        ).group_by(rollup.type).all()
+
+        by_category = db.session.query(
+            rollup.category_id,
+            func.sum(rollup.total)
+        ).filter(
+            rollup.user_id == self.user_id,
+            rollup.type == 'debit',
+            in_month
+        ).group_by(rollup.category_id).all()
+
+        all_time = {txn_type: float(total or 0) for txn_type, total, _ in by_type}
+        monthly = {txn_type: float(month_total or 0) for txn_type, _, month_total in by_type}
+        return {
+            'income': monthly.get('credit', 0),
+            'expenses': monthly.get('debit', 0),
+            'net_worth': all_time.get('credit', 0) - all_time.get('debit', 0),
+            'by_category': {category_id: float(total or 0) for category_id, total in by_category}
+        }
+
+    @staticmethod
+    def build_spending_data(categories, budgets, by_category):
+        """Per-category spent/limit/remaining rows for the template"""
+        spending_data = {}
+        category_totals = {}
+        total_spent = 0
+
+        for category in categories:
+            category_spent = by_category.get(category.id, 0)
+            budget = budgets.get(category.id)
+            budget_limit = budget.limit if budget else 0
+
+            spending_data[category.name] = {
+                'spent': category_spent,
+                'limit': budget_limit,
+                'remaining': max(0, budget_limit - category_spent),
+                'color': category.color,
+                'icon': category.icon
+            }
+            total_spent += category_spent
+            category_totals[category.name] = category_spent
+
+        return spending_data, category_totals, total_spent
@@ -0,0 +1,42 @@
+from datetime import date
+from dateutil.relativedelta import relativedelta
+from sqlalchemy import and_, or_
+
+
+def month_range(year, month):
+    """Half-open [first day, first day of next month) bounds for a month"""
+    start = date(year, month, 1)
+    return start, start + relativedelta(months=1)
+
+
+def in_month(column, year, month):
+    """Range predicate for one calendar month that an index on column can serve.
+
+    Use instead of extract('month') / extract('year'), which wrap the
+    column in a function and force a scan.
+    """
+    start, end = month_range(year, month)
+    return and_(column >= start, column < end)
+
+
+def in_month_of_any_year(column, month, first_year, last_year):
+    """Range predicate for a month across several years (e.g. every March)"""
+    return or_(*[
+        in_month(column, year, month)
+        for year in range(first_year, last_year + 1)
+    ])
+
+
+def previous_month(year, month):
+    return (year, month - 1) if month > 1 else (year - 1, 12)
+
+
+def add_months(year, month, delta):
+    """(year, month) shifted by delta calendar months"""
+    index = year * 12 + (month - 1) + delta
+    return index // 12, index % 12 + 1
+
+
+def trailing_months(year, month, count):
+    """The count calendar months ending with (year, month), oldest first"""
+    return [add_months(year, month, offset) for offset in range(1 - count, 1)]
@@ -0,0 +1,119 @@
+from collections import defaultdict
+from models import db, Transaction, Budget, Category
+from analytics import rollups
+from analytics.dates import in_month, previous_month
+
+# Insight generators, run in registration order. Each takes an
+# InsightContext and returns a list of insight dicts for the template.
+INSIGHT_GENERATORS = []
+
+
+def insight(generator):
+    INSIGHT_GENERATORS.append(generator)
+    return generator
+
+
+class InsightContext:
+    """Everything insight generators read for one user and month.
+
+    Built from three column-only queries (the month's debits joined to
+    their category names, the expense budgets, the previous month's total
+    from the rollup) and one grouping pass over the debit rows. Generators
+    only read these attributes, so adding one adds no queries.
+    """
+
+    def __init__(self, user_id, year, month):
+        self.user_id = user_id
+        self.year = year
+        self.month = month
+
+        rows = db.session.query(
+            Transaction.category_id,
+            Category.name,
+            Transaction.amount
+        ).outerjoin(
+            Category, Transaction.category_id == Category.id
+        ).filter(
+            Transaction.user_id == user_id,
+            Transaction.type == 'debit',  # Only expenses
+            in_month(Transaction.date, year, month)
+        ).all()
+
+        self.count = len(rows)
+        self.total_spent = 0.0
+        self.by_category = defaultdict(float)  # category_id -> amount
+        self.category_names = {}
+        for category_id, name, amount in rows:
+            self.total_spent += amount
+            self.by_category[category_id] += amount
+            self.category_names[category_id] = name
+
+        # (category_id, category name, limit) for expense budgets
+        self.budgets = db.session.query(
+            Budget.category_id,
+            Category.name,
+            Budget.limit
+        ).join(
+            Category, Budget.category_id == Category.id
+        ).filter(
+            Budget.user_id == user_id,
+            Category.is_income == False  # Only expense budgets
+        ).order_by(Budget.id).all()
+
+        prev_year, prev_month = previous_month(year, month)
+        self.prev_total = rollups.month_total(user_id, prev_year, prev_month)
+
+
+@insight
+def category_leader(ctx):
+    """Top spending category"""
+    if not ctx.by_category:
+        return []
+    category_id, amount = max(ctx.by_category.items(), key=lambda item: item[1])
+    return [{
+        'type': 'category_leader',
+        'category': ctx.category_names.get(category_id) or 'Uncategorized',
+        'amount': amount,
+        'percent': (amount / ctx.total_spent) * 100 if ctx.total_spent > 0 else 0
+    }]
+
+
+@insight
+def budget_progress(ctx):
+    """Spend against each expense budget"""
+    return [{
+        'type': 'budget_progress',
+        'category': name,
+        'spent': ctx.by_category.get(category_id, 0.0),
+        'limit': limit,
+        'percent': (ctx.by_category.get(category_id, 0.0) / limit) * 100
+    } for category_id, name, limit in ctx.budgets if limit > 0]
+
+
+@insight
+def month_over_month(ctx):
+    """Change against the previous month's spending"""
+    if ctx.prev_total <= 0:
+        return []
+    change = ((ctx.total_spent - ctx.prev_total) / ctx.prev_total) * 100
+    return [{
+        'type': 'trend',
+        'direction': 'up' if change > 0 else 'down',
+        'percent': abs(round(change, 1)),
+        'current_amount': ctx.total_spent
+    }]
+
+
+def generate_insights(user_id, selected_month, selected_year):
+    """Generate accurate spending insights"""
+    ctx = InsightContext(user_id, selected_year, selected_month)
+    if not ctx.count:
+        return []
+
+    insights = []
+    for generator in INSIGHT_GENERATORS:
+        try:
+            insights.extend(generator(ctx))
+        except Exception as e:
+            print(f"⚠️ Insight {generator.__name__} failed: {e}")
+    return insights
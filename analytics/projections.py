@@ -0,0 +1,120 @@
+from datetime import date, timedelta
+import numpy as np
+from dateutil.relativedelta import relativedelta
+from sqlalchemy import func
+from models import db, Transaction
+from analytics.dates import month_range
+
+MODELS = ('flat', 'day_of_month', 'ewma')
+
+
+class ProjectionEngine:
+    """Month-end expense projections for every category at once.
+
+    One grouped query fetches per-category daily debit totals for the
+    history window plus the projected month. They land in a
+    (categories x days) matrix and each model is a few array operations
+    over it, so the cost does not depend on the number of categories.
+
+    Models, giving the expected spend for each remaining day:
+      flat          history total / history days
+      day_of_month  mean spend on that day of the month across the history
+                    (rent on the 1st, salary-day shopping), flat rate for
+                    days the history never saw
+      ewma          exponentially weighted daily mean over history and the
+                    month so far, halving every halflife_days
+    """
+
+    def __init__(self, user_id, year, month, model='flat', history_months=3,
+                 halflife_days=14, today=None):
+        if model not in MODELS:
+            raise ValueError(f"Unknown projection model: {model}")
+        self.user_id = user_id
+        self.model = model
+        self.halflife_days = halflife_days
+        self.today = today or date.today()
+
+        self.month_start, self.month_end = month_range(year, month)
+        self.history_start = self.month_start - relativedelta(months=history_months)
+        self.history_days = (self.month_start - self.history_start).days
+        self.days_in_month = (self.month_end - self.month_start).days
+
+        # Days of the projected month already observed
+        elapsed = (self.today - self.month_start).days + 1
+        self.elapsed_days = min(max(elapsed, 0), self.days_in_month)
+        self.days_remaining = self.days_in_month - self.elapsed_days
+
+    def daily_matrix(self, category_ids):
+        """(len(category_ids), history days + days in month) array of debit totals"""
+        rows = db.session.query(
+            Transaction.category_id,
+            Transaction.date,
+            func.sum(Transaction.amount)
+        ).filter(
+            Transaction.user_id == self.user_id,
+            Transaction.type == 'debit',
+            Transaction.date >= self.history_start,
+            Transaction.date < self.month_end
+        ).group_by(Transaction.category_id, Transaction.date).all()
+
+        position = {category_id: i for i, category_id in enumerate(category_ids)}
+        matrix = np.zeros((len(category_ids), self.history_days + self.days_in_month))
+        rows = [row for row in rows if row[0] in position]
+        if rows:
+            cat_idx = np.fromiter((position[c] for c, _, _ in rows), dtype=np.intp, count=len(rows))
+            day_idx = np.fromiter(((d - self.history_start).days for _, d, _ in rows), dtype=np.intp, count=len(rows))
+            amounts = np.fromiter((float(a or 0) for _, _, a in rows), dtype=float, count=len(rows))
+            np.add.at(matrix, (cat_idx, day_idx), amounts)
+        return matrix
+
+    def project(self, categories):
+        """{category name: {'current', 'daily_rate', 'projected'}} plus totals"""
+        matrix = self.daily_matrix([c.id for c in categories])
+        history = matrix[:, :self.history_days]
+        current = matrix[:, self.history_days:].sum(axis=1)
+
+        flat_rate = history.sum(axis=1) / self.history_days if self.history_days else np.zeros(len(categories))
+        if self.model == 'day_of_month':
+            remaining = self._day_of_month_remaining(history, flat_rate)
+            daily_rate = remaining / self.days_remaining if self.days_remaining else flat_rate
+        elif self.model == 'ewma':
+            daily_rate = self._ewma_rate(matrix[:, :self.history_days + self.elapsed_days])
+            remaining = daily_rate * self.days_remaining
+        else:
+            daily_rate = flat_rate
+            remaining = daily_rate * self.days_remaining
+        projected = current + remaining
+
+        return {
+            'model': self.model,
+            'total': float(projected.sum()),
+            'daily_rate': float(daily_rate.sum()),
+            'days_remaining': self.days_remaining,
+            'categories': {
+                category.name: {
+                    'current': float(current[i]),
+                    'daily_rate': float(daily_rate[i]),
+                    'projected': float(projected[i])
+                }
+                for i, category in enumerate(categories)
+            }
+        }
+
+    def _day_of_month_remaining(self, history, flat_rate):
+        history_dom = np.array([
+            (self.history_start + timedelta(days=i)).day - 1 for i in range(self.history_days)
+        ], dtype=np.intp)
+        spend_by_dom = np.zeros((history.shape[0], 31))
+        np.add.at(spend_by_dom.T, history_dom, history.T)
+        seen = np.bincount(history_dom, minlength=31)
+
+        profile = np.where(seen > 0, spend_by_dom / np.maximum(seen, 1), flat_rate[:, None])
+        remaining_dom = np.arange(self.elapsed_days, self.days_in_month)
+        return profile[:, remaining_dom].sum(axis=1)
+
+    def _ewma_rate(self, observed):
+        if observed.shape[1] == 0:
+            return np.zeros(observed.shape[0])
+        age = np.arange(observed.shape[1] - 1, -1, -1)
+        weights = 0.5 ** (age / self.halflife_days)
+        return observed @ weights / weights.sum()
@@ -0,0 +1,226 @@
+from collections import defaultdict
+from sqlalchemy import func, insert
+from sqlalchemy.exc import IntegrityError
+from models import db, Transaction, MonthlyCategoryTotal
+
+
+def _key_filter(user_id, category_id, year, month, txn_type):
+    return (
+        MonthlyCategoryTotal.user_id == user_id,
+        MonthlyCategoryTotal.category_id.is_(None) if category_id is None
+        else MonthlyCategoryTotal.category_id == category_id,
+        MonthlyCategoryTotal.year == year,
+        MonthlyCategoryTotal.month == month,
+        MonthlyCategoryTotal.type == txn_type
+    )
+
+
+def apply_deltas(user_id, deltas):
+    """Add (amount, count) deltas keyed by (category_id, year, month, type).
+
+    Each key is an atomic UPDATE ... SET total = total + delta, falling
+    back to an INSERT when the row does not exist yet, so concurrent
+    imports never lose each other's increments. Rows a negative delta
+    empties are deleted, so none is left pointing at a category that has
+    no transactions. Runs inside the caller's transaction.
+    """
+    table = MonthlyCategoryTotal.__table__
+    for (category_id, year, month, txn_type), (amount, count) in deltas.items():
+        if not amount and not count:
+            continue
+
+        key = _key_filter(user_id, category_id, year, month, txn_type)
+        updated = db.session.query(MonthlyCategoryTotal).filter(*key).update({
+            MonthlyCategoryTotal.total: MonthlyCategoryTotal.total + amount,
+            MonthlyCategoryTotal.count: MonthlyCategoryTotal.count + count
+        }, synchronize_session=False)
+        if updated:
+            if count < 0:
+                db.session.query(MonthlyCategoryTotal).filter(
+                    *key, MonthlyCategoryTotal.count <= 0
+                ).delete(synchronize_session=False)
+            continue
+
+        try:
+            with db.session.begin_nested():
+                db.session.execute(insert(table).values(
+                    user_id=user_id,
+                    category_id=category_id,
+                    year=year,
+                    month=month,
+                    type=txn_type,
+                    total=amount,
+                    count=count
+                ))
+        except IntegrityError:
+            # Another writer created the row between our UPDATE and INSERT
+            db.session.query(MonthlyCategoryTotal).filter(*key).update({
+                MonthlyCategoryTotal.total: MonthlyCategoryTotal.total + amount,
+                MonthlyCategoryTotal.count: MonthlyCategoryTotal.count + count
+            }, synchronize_session=False)
+
+
+def deltas_for_records(records, sign=1):
+    """Group transaction dicts (category_id, date, amount, type) into rollup deltas"""
+    deltas = defaultdict(lambda: [0.0, 0])
+    for record in records:
+        key = (record['category_id'], record['date'].year, record['date'].month, record['type'])
+        deltas[key][0] += sign * record['amount']
+        deltas[key][1] += sign
+    return {key: tuple(value) for key, value in deltas.items()}
+
+
+def _single(txn, category_id, sign):
+    return {
+        (category_id, txn.date.year, txn.date.month, txn.type): (sign * txn.amount, sign)
+    }
+
+
+def record_added(txn):
+    apply_deltas(txn.user_id, _single(txn, txn.category_id, 1))
+
+
+def record_removed(txn):
+    apply_deltas(txn.user_id, _single(txn, txn.category_id, -1))
+
+
+def record_recategorized(txn, old_category_id):
+    if old_category_id == txn.category_id:
+        return
+    deltas = _single(txn, old_category_id, -1)
+    deltas.update(_single(txn, txn.category_id, 1))
+    apply_deltas(txn.user_id, deltas)
+
+
+def rebuild(user_id=None):
+    """Recompute the rollup from raw transactions (backfills and repairs)"""
+    year = db.extract('year', Transaction.date)
+    month = db.extract('month', Transaction.date)
+
+    query = db.session.query(
+        Transaction.user_id,
+        Transaction.category_id,
+        year,
+        month,
+        Transaction.type,
+        func.sum(Transaction.amount),
+        func.count(Transaction.id)
+    ).filter(Transaction.user_id.isnot(None))
+    delete = MonthlyCategoryTotal.query
+    if user_id is not None:
+        query = query.filter(Transaction.user_id == user_id)
+        delete = delete.filter(MonthlyCategoryTotal.user_id == user_id)
+
+    rows = [
+        {
+            'user_id': row_user_id,
+            'category_id': category_id,
+            'year': int(row_year),
+            'month': int(row_month),
+            'type': txn_type,
+            'total': float(total or 0),
+            'count': count
+        }
+        for row_user_id, category_id, row_year, row_month, txn_type, total, count
+        in query.group_by(Transaction.user_id, Transaction.category_id, year, month, Transaction.type)
+    ]
+
+    delete.delete(synchronize_session=False)
+    if rows:
+        db.session.execute(insert(MonthlyCategoryTotal.__table__), rows)
+    db.session.commit()
+    return len(rows)
+
+
+def backfill():
+    """Build the rollup for a database whose transactions predate it.
+
+    Returns the number of rows written, or None when the rollup already
+    has rows (or there is nothing to roll up).
+    """
+    if db.session.query(MonthlyCategoryTotal.id).first() is not None:
+        return None
+    if db.session.query(Transaction.id).filter(Transaction.user_id.isnot(None)).first() is None:
+        return None
+    try:
+        return rebuild()
+    except IntegrityError:
+        # Another worker backfilled at the same time
+        db.session.rollback()
+        return None
+
+
+def _period_filter(periods):
+    """Match any of the given (year, month) pairs"""
+    return db.or_(*[
+        db.and_(MonthlyCategoryTotal.year == year, MonthlyCategoryTotal.month == month)
+        for year, month in periods
+    ])
+
+
+def month_total(user_id, year, month, txn_type='debit'):
+    """Sum of one month's transactions of a type, read from the rollup"""
+    return float(db.session.query(
+        func.sum(MonthlyCategoryTotal.total)
+    ).filter(
+        MonthlyCategoryTotal.user_id == user_id,
+        MonthlyCategoryTotal.type == txn_type,
+        MonthlyCategoryTotal.year == year,
+        MonthlyCategoryTotal.month == month
+    ).scalar() or 0)
+
+
+def monthly_totals(user_id, start, end, txn_type='debit'):
+    """{(year, month): total} for the half-open period range [start, end).
+
+    start and end are (year, month) pairs; months without rows are absent.
+    """
+    (start_year, start_month), (end_year, end_month) = start, end
+    rows = db.session.query(
+        MonthlyCategoryTotal.year,
+        MonthlyCategoryTotal.month,
+        func.sum(MonthlyCategoryTotal.total)
+    ).filter(
+        MonthlyCategoryTotal.user_id == user_id,
+        MonthlyCategoryTotal.type == txn_type,
+        # year range for the (user_id, year, month) index, then the exact bounds
+        MonthlyCategoryTotal.year.between(start_year, end_year),
+        db.or_(MonthlyCategoryTotal.year > start_year, MonthlyCategoryTotal.month >= start_month),
+        db.or_(MonthlyCategoryTotal.year < end_year, MonthlyCategoryTotal.month < end_month)
+    ).group_by(
+        MonthlyCategoryTotal.year,
+        MonthlyCategoryTotal.month
+    ).all()
+    return {(int(year), int(month)): float(total or 0) for year, month, total in rows}
+
+
+def category_totals(user_id, periods, txn_type='debit'):
+    """{category_id: total} over the given (year, month) periods"""
+    rows = db.session.query(
+        MonthlyCategoryTotal.category_id,
+        func.sum(MonthlyCategoryTotal.total)
+    ).filter(
+        MonthlyCategoryTotal.user_id == user_id,
+        MonthlyCategoryTotal.type == txn_type,
+        _period_filter(periods)
+    ).group_by(MonthlyCategoryTotal.category_id).all()
+    return {category_id: float(total or 0) for category_id, total in rows}
+
+
+def months_with_activity(user_id):
+    """(year, month, transaction count) for every month with data, newest first"""
+    return db.session.query(
+        MonthlyCategoryTotal.year,
+        MonthlyCategoryTotal.month,
+        func.sum(MonthlyCategoryTotal.count)
+    ).filter(
+        MonthlyCategoryTotal.user_id == user_id
+    ).group_by(
+        MonthlyCategoryTotal.year,
+        MonthlyCategoryTotal.month
+    ).having(
+        func.sum(MonthlyCategoryTotal.count) > 0
+    ).order_by(
+        MonthlyCategoryTotal.year.desc(),
+        MonthlyCategoryTotal.month.desc()
+    ).all()
@@ -0,0 +1,129 @@
+"""Compare extract()-based month filters with half-open date ranges.
+
+Builds a throwaway SQLite database with the real transactions schema
+(including its composite indexes), fills it with synthetic rows and times
+the dashboard's monthly-expense query written both ways.
+
+Usage:
+    python benchmarks/bench_date_predicates.py [--rows 1000000] [--users 1000]
+        [--queries 200] [--no-indexes] [--db /tmp/bench.db]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, extract, func, insert, select, text
+from models import Transaction
+from analytics.dates import in_month
+
+table = Transaction.__table__
+
+
+def populate(engine, rows, users, seed=42):
+    rng = random.Random(seed)
+    first_day = date(2015, 1, 1)
+    span_days = (date(2025, 12, 31) - first_day).days
+    batch = []
+    with engine.begin() as conn:
+        for i in range(rows):
+            batch.append({
+                'user_id': rng.randint(1, users),
+                'category_id': rng.randint(1, 25),
+                'date': first_day + timedelta(days=rng.randint(0, span_days)),
+                'description': f'merchant {rng.randint(1, 5000)}',
+                'amount': round(rng.uniform(1, 20000), 2),
+                'type': 'debit' if rng.random() < 0.8 else 'credit'
+            })
+            if len(batch) == 50000:
+                conn.execute(insert(table), batch)
+                batch = []
+        if batch:
+            conn.execute(insert(table), batch)
+
+
+def extract_query(user_id, year, month):
+    return select(func.sum(table.c.amount)).where(
+        table.c.user_id == user_id,
+        table.c.type == 'debit',
+        extract('month', table.c.date) == month,
+        extract('year', table.c.date) == year
+    )
+
+
+def range_query(user_id, year, month):
+    return select(func.sum(table.c.amount)).where(
+        table.c.user_id == user_id,
+        table.c.type == 'debit',
+        in_month(table.c.date, year, month)
+    )
+
+
+def time_queries(engine, build, samples):
+    with engine.connect() as conn:
+        started = time.perf_counter()
+        for user_id, year, month in samples:
+            conn.execute(build(user_id, year, month)).scalar()
+        return (time.perf_counter() - started) / len(samples) * 1000
+
+
+def query_plan(engine, statement):
+    compiled = statement.compile(engine)
+    params = tuple(
+        value.isoformat() if isinstance(value, date) else value
+        for value in (compiled.params[name] for name in compiled.positiontup)
+    )
+    with engine.connect() as conn:
+        rows = conn.exec_driver_sql(f'EXPLAIN QUERY PLAN {compiled}', params)
+        return [row[-1] for row in rows]
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('--rows', type=int, default=1_000_000)
+    ap.add_argument('--users', type=int, default=1000)
+    ap.add_argument('--queries', type=int, default=200)
+    ap.add_argument('--no-indexes', action='store_true', help='drop the composite indexes first')
+    ap.add_argument('--db', help='SQLite file to use (default: a temp file)')
+    args = ap.parse_args()
+
+    db_path = args.db or os.path.join(tempfile.mkdtemp(), 'bench_dates.db')
+    engine = create_engine(f'sqlite:///{db_path}')
+    fresh = not os.path.exists(db_path) or os.path.getsize(db_path) == 0
+    table.create(engine, checkfirst=True)
+
+    if fresh:
+        started = time.perf_counter()
+        populate(engine, args.rows, args.users)
+        print(f"Inserted {args.rows:,} rows in {time.perf_counter() - started:.1f}s")
+
+    if args.no_indexes:
+        with engine.begin() as conn:
+            for index in table.indexes:
+                conn.execute(text(f'DROP INDEX IF EXISTS {index.name}'))
+    else:
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
+    with engine.begin() as conn:
+        conn.execute(text('ANALYZE'))
+
+    rng = random.Random(7)
+    samples = [
+        (rng.randint(1, args.users), rng.randint(2015, 2025), rng.randint(1, 12))
+        for _ in range(args.queries)
+    ]
+
+    for name, build in (('extract()', extract_query), ('date range', range_query)):
+        avg_ms = time_queries(engine, build, samples)
+        print(f"\n{name:<11} {avg_ms:8.3f} ms/query")
+        for step in query_plan(engine, build(*samples[0])):
+            print(f"    plan: {step}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+"""Compare loading the pickled classifier with the memory-mapped artifact.
+
+Each format is loaded in fresh interpreters (pandas/sklearn/numpy are
+imported before the clock starts, so only the model load is timed). For
+each it reports load time, RSS growth from the load and from a first
+prediction, and the total PSS of --processes concurrent processes holding
+the model: mapped artifact pages are shared, unpickled ones are not.
+Also checks that both formats predict the same classes.
+
+Usage:
+    python benchmarks/bench_model_load.py [--pickle transaction_classifier.pkl]
+        [--artifact transaction_classifier.artifact] [--rows 2000]
+        [--processes 4] [--repeat 3]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = r"""
+import hashlib, json, os, sys, time
+import numpy as np
+import pandas as pd
+import sklearn.ensemble, sklearn.pipeline, sklearn.compose
+sys.path.insert(0, {root!r})
+
+def rss():
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+
+def pss():
+    with open('/proc/self/smaps_rollup') as f:
+        for line in f:
+            if line.startswith('Pss:'):
+                return int(line.split()[1]) * 1024
+
+rng = np.random.default_rng(0)
+words = ['coffee', 'uber', 'amazon', 'grocery', 'salary', 'rent', 'netflix', 'fuel', 'pharmacy', 'transfer']
+rows = {rows}
+X = pd.DataFrame({{
+    'Description': [' '.join(rng.choice(words, 3)) for _ in range(rows)],
+    'Amount': rng.uniform(1, 5000, rows).round(2),
+    'Type': rng.choice(['DEBIT', 'CREDIT'], rows)
+}})
+
+before = rss()
+started = time.perf_counter()
+if {kind!r} == 'pickle':
+    import joblib
+    model = joblib.load({path!r})
+else:
+    from ml.artifacts import load_artifact
+    model = load_artifact({path!r})
+load_seconds = time.perf_counter() - started
+after_load = rss()
+
+predicted = model.predict(X)
+after_predict = rss()
+
+print(json.dumps({{
+    'load_seconds': load_seconds,
+    'rss_load': after_load - before,
+    'rss_predict': after_predict - before,
+    'pss': pss(),
+    'digest': hashlib.sha256(np.asarray(predicted, dtype=np.int64).tobytes()).hexdigest(),
+    'predicted': [int(p) for p in predicted[:2000]]
+}}), flush=True)
+if {hold}:
+    sys.stdin.read()  # stay alive until the parent has measured everyone
+"""
+
+
+def run_child(kind, path, rows, hold=False):
+    code = CHILD.format(root=ROOT, kind=kind, path=path, rows=rows, hold=hold)
+    return subprocess.Popen(
+        [sys.executable, '-c', code], cwd=ROOT,
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True
+    )
+
+
+def single(kind, path, rows):
+    proc = run_child(kind, path, rows)
+    out, _ = proc.communicate()
+    if proc.returncode != 0:
+        sys.exit(f"{kind} run failed")
+    return json.loads(out)
+
+
+def concurrent_pss(kind, path, rows, processes):
+    procs = [run_child(kind, path, rows, hold=True) for _ in range(processes)]
+    try:
+        # Each child reports its PSS once loaded and warm, then waits
+        return sum(json.loads(p.stdout.readline())['pss'] for p in procs)
+    finally:
+        for p in procs:
+            p.stdin.close()
+            p.wait()
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('--pickle', default=os.path.join(ROOT, 'transaction_classifier.pkl'))
+    ap.add_argument('--artifact', default=os.path.join(ROOT, 'transaction_classifier.artifact'))
+    ap.add_argument('--rows', type=int, default=2000, help='rows predicted after loading')
+    ap.add_argument('--processes', type=int, default=4)
+    ap.add_argument('--repeat', type=int, default=3)
+    args = ap.parse_args()
+
+    mib = 1024 * 1024
+    results = {}
+    print(f"{'format':<9} {'load (ms)':>10} {'RSS load':>9} {'RSS +predict':>13} "
+          f"{f'PSS x{args.processes}':>9}   (MiB)")
+    for kind, path in (('pickle', args.pickle), ('artifact', args.artifact)):
+        runs = [single(kind, path, args.rows) for _ in range(args.repeat)]
+        results[kind] = runs[0]
+        total_pss = concurrent_pss(kind, path, args.rows, args.processes)
+        print(f"{kind:<9} {statistics.median(r['load_seconds'] for r in runs) * 1000:>10.1f} "
+              f"{statistics.median(r['rss_load'] for r in runs) / mib:>9.1f} "
+              f"{statistics.median(r['rss_predict'] for r in runs) / mib:>13.1f} "
+              f"{total_pss / mib:>9.1f}")
+
+    pickle_pred, artifact_pred = results['pickle']['predicted'], results['artifact']['predicted']
+    mismatches = sum(a != b for a, b in zip(pickle_pred, artifact_pred))
+    if results['pickle']['digest'] == results['artifact']['digest']:
+        print("\npredictions: identical")
+    else:
+        print(f"\npredictions: {mismatches} of the first {len(pickle_pred)} rows differ")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""Compare PDF statement parsing time across worker counts.
+
+Each worker count gets a fresh page-parsing pool: "first" includes
+starting it (interpreters plus the camelot import), "best" is the fastest
+of the repeats on the warm pool, which is what every later statement a
+worker parses costs. Without PDFs on the command line, synthetic
+statements are generated with make_statement_pdf.py.
+
+Usage:
+    python benchmarks/bench_pdf_parse.py [statement1.pdf ...]
+        [--workers 1 2 4 8] [--pages-per-chunk 4] [--repeat 3]
+        [--generate-pages 8 32]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parsers import bank_parser
+from parsers.bank_parser import BankStatementParser
+from make_statement_pdf import write_statement
+
+
+def time_parse(pdf_path, workers, pages_per_chunk, repeat):
+    """(first, best) seconds and the row count, starting from no pool"""
+    if bank_parser._pdf_pool is not None:
+        bank_parser._pdf_pool.shutdown(wait=True)
+    bank_parser._discard_pdf_pool()
+
+    parser = BankStatementParser(pdf_workers=workers, pages_per_chunk=pages_per_chunk)
+    timings = []
+    rows = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        df = parser.parse_file(pdf_path, 'pdf')
+        timings.append(time.perf_counter() - started)
+        rows = len(df)
+    return timings[0], min(timings[1:] or timings), rows
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('pdfs', nargs='*', help='multi-page statements (default: generated ones)')
+    ap.add_argument('--workers', nargs='+', type=int, default=[1, 2, 4, 8])
+    ap.add_argument('--pages-per-chunk', type=int, default=4)
+    ap.add_argument('--repeat', type=int, default=3)
+    ap.add_argument('--generate-pages', nargs='+', type=int, default=[8, 32],
+                    help='transaction pages of each generated statement')
+    args = ap.parse_args()
+
+    pdfs = args.pdfs
+    if not pdfs:
+        fixture_dir = tempfile.mkdtemp(prefix='bench_pdf_')
+        pdfs = []
+        for pages in args.generate_pages:
+            path = os.path.join(fixture_dir, f'statement_{pages}p.pdf')
+            write_statement(path, pages=pages)
+            pdfs.append(path)
+
+    print(f"{'file':<30} {'workers':>7} {'first (s)':>9} {'best (s)':>9} {'speedup':>8} {'rows':>6}")
+    for pdf_path in pdfs:
+        baseline = None
+        baseline_rows = None
+        for workers in args.workers:
+            first, seconds, rows = time_parse(pdf_path, workers, args.pages_per_chunk, args.repeat)
+            if baseline is None:
+                baseline, baseline_rows = seconds, rows
+            flag = '' if rows == baseline_rows else '  (row count differs!)'
+            print(f"{os.path.basename(pdf_path)[:30]:<30} {workers:>7} {first:>9.2f} {seconds:>9.2f} "
+                  f"{baseline / seconds:>7.2f}x {rows:>6}{flag}")
+
+
+if __name__ == '__main__':
+    main()
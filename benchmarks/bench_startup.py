@@ -0,0 +1,90 @@
+"""Measure app.py cold-start cost.
+
+Runs `python -X importtime -c "import app"` and lists the slowest imports,
+then times fresh interpreters from launch to the first served response
+(GET /login through the test client, which also runs the one-time
+database setup). Uses a throwaway SQLite database via DATABASE_URL so no
+MySQL server is needed.
+
+Usage:
+    python benchmarks/bench_startup.py [--top 25] [--repeat 5] [--path /login]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FIRST_RESPONSE = """
+from app import create_app
+response = create_app().test_client().get({path!r})
+assert response.status_code < 500, response.status_code
+"""
+
+
+def bench_env():
+    env = dict(os.environ)
+    env.setdefault('DATABASE_URL', f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench_startup.db')}")
+    return env
+
+
+def import_times(env):
+    """[(cumulative_us, self_us, module)] from -X importtime, slowest first"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import app'],
+        cwd=ROOT, env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        sys.exit(f"import app failed:\n{result.stderr[-2000:]}")
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, module = line[len('import time:'):].split('|')
+        # nested imports are indented below their parent
+        rows.append((int(cumulative_us), int(self_us), module[1:].rstrip()))
+    return sorted(rows, reverse=True)
+
+
+def first_response_seconds(env, path):
+    started = time.perf_counter()
+    subprocess.run(
+        [sys.executable, '-c', FIRST_RESPONSE.format(path=path)],
+        cwd=ROOT, env=env, check=True
+    )
+    return time.perf_counter() - started
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('--top', type=int, default=25, help='slowest imports to list')
+    ap.add_argument('--repeat', type=int, default=5)
+    ap.add_argument('--path', default='/login', help='URL requested for time to first response')
+    args = ap.parse_args()
+
+    env = bench_env()
+    rows = import_times(env)
+    top_level = [row for row in rows if not row[2].startswith(' ')]
+    total_us = sum(cumulative for cumulative, _, _ in top_level)
+
+    print(f"import app: {total_us / 1e6:.3f}s across {len(rows)} modules\n")
+    print(f"{'cumulative (ms)':>15} {'self (ms)':>10}  module")
+    for cumulative_us, self_us, module in rows[:args.top]:
+        print(f"{cumulative_us / 1000:>15.1f} {self_us / 1000:>10.1f}  {module}")
+
+    heavy = ['pandas', 'numpy', 'sklearn', 'camelot', 'fitz', 'joblib']
+    loaded = {module.strip().split('.')[0] for _, _, module in rows}
+    print(f"\nheavy stacks imported at startup: {', '.join(m for m in heavy if m in loaded) or 'none'}")
+
+    timings = [first_response_seconds(env, args.path) for _ in range(args.repeat)]
+    print(f"\nlaunch to first response ({args.path}), {args.repeat} runs: "
+          f"median {statistics.median(timings):.3f}s, best {min(timings):.3f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""Per-worker memory of gunicorn with and without preloading.
+
+Starts gunicorn (using gunicorn.conf.py) with each worker count, with
+preload_app on and off, waits until every worker answers, and reads RSS
+and PSS from /proc/<pid>/smaps_rollup. PSS splits shared pages between
+the processes sharing them, so with preloading the per-worker PSS should
+drop well below RSS while the total stays close to one model copy.
+
+Linux only. Uses a throwaway SQLite database via DATABASE_URL unless one
+is already set.
+
+Usage:
+    python benchmarks/bench_worker_memory.py [--workers 1 4 8] [--port 8765]
+"""
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def memory_kb(pid):
+    """(rss, pss) in kB for one process"""
+    fields = {}
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if parts[0] in ('Rss:', 'Pss:'):
+                fields[parts[0][:-1]] = int(parts[1])
+    return fields.get('Rss', 0), fields.get('Pss', 0)
+
+
+def child_pids(pid):
+    pids = []
+    task_dir = f'/proc/{pid}/task'
+    for task in os.listdir(task_dir):
+        with open(f'{task_dir}/{task}/children') as f:
+            pids.extend(int(child) for child in f.read().split())
+    return pids
+
+
+def wait_until_serving(port, expected_workers, master_pid, timeout=120):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(f'http://127.0.0.1:{port}/login', timeout=5).read()
+            if len(child_pids(master_pid)) >= expected_workers:
+                return
+        except Exception:
+            pass
+        time.sleep(0.5)
+    raise RuntimeError('gunicorn did not come up in time')
+
+
+def measure(workers, preload, port, env):
+    env = dict(env, GUNICORN_PRELOAD='1' if preload else '0')
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py',
+         '-w', str(workers), '-b', f'127.0.0.1:{port}'],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        wait_until_serving(port, workers, server.pid)
+        # Spread a few requests so every worker has handled one
+        for _ in range(workers * 4):
+            urllib.request.urlopen(f'http://127.0.0.1:{port}/login', timeout=5).read()
+        master = memory_kb(server.pid)
+        children = [memory_kb(pid) for pid in child_pids(server.pid)]
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout=30)
+    return master, children
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('--workers', nargs='+', type=int, default=[1, 4, 8])
+    ap.add_argument('--port', type=int, default=8765)
+    args = ap.parse_args()
+
+    env = dict(os.environ)
+    env.setdefault('DATABASE_URL', f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench_memory.db')}")
+
+    print(f"{'workers':>7} {'preload':>7} {'master RSS':>11} {'worker RSS':>11} "
+          f"{'worker PSS':>11} {'total PSS':>10}   (MiB, worker figures are means)")
+    for workers in args.workers:
+        for preload in (False, True):
+            (master_rss, master_pss), children = measure(workers, preload, args.port, env)
+            worker_rss = sum(rss for rss, _ in children) / len(children)
+            worker_pss = sum(pss for _, pss in children) / len(children)
+            total_pss = master_pss + sum(pss for _, pss in children)
+            print(f"{workers:>7} {'yes' if preload else 'no':>7} {master_rss / 1024:>11.1f} "
+                  f"{worker_rss / 1024:>11.1f} {worker_pss / 1024:>11.1f} {total_pss / 1024:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""Write synthetic multi-page PDF statements for bench_pdf_parse.py.
+
+Pages follow the layout BankStatementParser expects: a cover page, then
+transaction pages whose rows (date, description, credit, debit) sit inside
+TABLE_AREAS, then two trailing summary pages. Some descriptions wrap onto
+a second line, as on real statements.
+
+Usage:
+    python benchmarks/make_statement_pdf.py out.pdf [--pages 24] [--rows-per-page 25] [--seed 0]
+"""
+import argparse
+import random
+import fitz
+
+MERCHANTS = [
+    'KFC NEW KINGSTON', 'JUICI PATTIES HWT', 'UBER TRIP', 'TEXACO CONSTANT SPRING',
+    'DIGICEL TOPUP', 'JPS ELECTRICITY', 'HI-LO FOOD STORES', 'AMAZON MKTP US*2K4'
+]
+PAGE_WIDTH, PAGE_HEIGHT = 612, 792
+# x of each column and the first / last row baselines, inside TABLE_AREAS
+COLUMNS = {'date': 40, 'description': 120, 'credit': 400, 'debit': 500}
+FIRST_ROW_Y, LAST_ROW_Y = 180, 720
+FONT_SIZE = 9
+
+
+def write_statement(path, pages=24, rows_per_page=25, seed=0):
+    """Write a statement with `pages` transaction pages; returns the number of transactions"""
+    rng = random.Random(seed)
+    line_height = (LAST_ROW_Y - FIRST_ROW_Y) / (rows_per_page * 1.2)
+    doc = fitz.open()
+
+    doc.new_page(width=PAGE_WIDTH, height=PAGE_HEIGHT).insert_text(
+        (40, 100), 'ACCOUNT STATEMENT', fontsize=14
+    )
+    transactions = 0
+    for _ in range(pages):
+        page = doc.new_page(width=PAGE_WIDTH, height=PAGE_HEIGHT)
+        y = FIRST_ROW_Y
+        for _ in range(rows_per_page):
+            is_credit = rng.random() < 0.1
+            description = 'SALARY ACME LTD' if is_credit else rng.choice(MERCHANTS)
+            amount = f"{rng.uniform(100, 150000 if is_credit else 8000):,.2f}"
+            page.insert_text((COLUMNS['date'], y), f"{rng.randint(1, 28):02d}-Jan-23", fontsize=FONT_SIZE)
+            page.insert_text((COLUMNS['description'], y), description, fontsize=FONT_SIZE)
+            page.insert_text((COLUMNS['credit' if is_credit else 'debit'], y), amount, fontsize=FONT_SIZE)
+            y += line_height
+            if rng.random() < 0.2:
+                # Wrapped reference line, merged into its row by the parser
+                page.insert_text((COLUMNS['description'], y), f"REF {rng.randint(10 ** 5, 10 ** 6)}",
+                                 fontsize=FONT_SIZE)
+                y += line_height * 0.2
+            transactions += 1
+
+    for title in ('SUMMARY', 'IMPORTANT INFORMATION'):
+        doc.new_page(width=PAGE_WIDTH, height=PAGE_HEIGHT).insert_text((40, 100), title, fontsize=14)
+    doc.save(path)
+    doc.close()
+    return transactions
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('path')
+    ap.add_argument('--pages', type=int, default=24, help='transaction pages')
+    ap.add_argument('--rows-per-page', type=int, default=25)
+    ap.add_argument('--seed', type=int, default=0)
+    args = ap.parse_args()
+    count = write_statement(args.path, args.pages, args.rows_per_page, args.seed)
+    print(f"Wrote {args.path}: {args.pages + 3} pages, {count} transactions")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,20 @@
+import multiprocessing
+import os
+
+# The factory runs the warmup hooks (database, default categories,
+# classifier). With preload_app that happens once in the master. Web
+# workers fork from it, and each worker's import pool forks from the worker
+# (import_jobs.get_executor), so the processes that classify statements
+# share the master's model pages copy-on-write.
+wsgi_app = 'app:create_app(warmup=True)'
+preload_app = os.environ.get('GUNICORN_PRELOAD', '1') == '1'
+
+bind = os.environ.get('GUNICORN_BIND', '127.0.0.1:8000')
+workers = int(os.environ.get('GUNICORN_WORKERS', min(4, multiprocessing.cpu_count())))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 60))
+
+# A memory result cache is private to each worker, so invalidating it after
+# a write would leave the other workers serving stale dashboards; with more
+# than one worker default to the SQLite cache they all share
+if workers > 1:
+    os.environ.setdefault('RESULT_CACHE_BACKEND', 'sqlite')
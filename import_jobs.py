@@ -0,0 +1,286 @@
+import multiprocessing
+import os
+import threading
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta
+from sqlalchemy import update
+from models import db, ImportJob
+
+# Statement imports run in a local process pool, and the import_jobs table
+# is the queue: the pool is handed job ids, and a pool process only runs a
+# job once it has atomically claimed the queued row. Running jobs beat a
+# heartbeat, so jobs left behind when a web worker (and its pool) dies are
+# requeued by the next worker to start. No external broker is needed.
+_executor = None
+_executor_lock = threading.Lock()
+
+# Heartbeats a running job may miss before it counts as orphaned
+STALE_BEATS = 4
+
+# The app the pool was created from; forked pool processes run jobs with it
+_app = None
+
+
+def get_executor(app, max_workers=2):
+    """Lazily create the process pool shared by this web worker.
+
+    The pool forks, so its processes inherit the classifier the warmup
+    hooks loaded before the web workers forked: every import process
+    shares those model pages with the master instead of loading its own.
+    """
+    global _executor, _app
+    with _executor_lock:
+        if _executor is None:
+            _app = app
+            _executor = ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context('fork'),
+                initializer=_init_pool_process
+            )
+        return _executor
+
+
+def _init_pool_process():
+    # Drop the inherited database connections without closing them; they
+    # still belong to the web worker
+    with _app.app_context():
+        db.session.remove()
+        db.engine.dispose(close=False)
+
+
+def enqueue_import(app, user_id, file_path, file_type, filename):
+    """Record a queued job and hand it to the pool; returns the ImportJob"""
+    job = ImportJob(
+        user_id=user_id,
+        filename=filename,
+        file_path=file_path,
+        file_type=file_type,
+        status='queued'
+    )
+    db.session.add(job)
+    db.session.commit()
+
+    _submit(app, job.id)
+    return job
+
+
+def resume_import(app, job):
+    """Re-queue a failed job; it continues after the last committed chunk"""
+    job.status = 'queued'
+    job.error = None
+    job.finished_at = None
+    db.session.commit()
+
+    _submit(app, job.id)
+    return job
+
+
+def expire_failed_uploads(app):
+    """Delete the uploads of jobs that failed more than IMPORT_UPLOAD_RETENTION_DAYS ago.
+
+    A failed job keeps its bank statement on disk so it can be resumed;
+    past the retention period it can no longer be. Returns the number of
+    files removed.
+    """
+    days = app.config.get('IMPORT_UPLOAD_RETENTION_DAYS', 7)
+    expired = ImportJob.query.filter(
+        ImportJob.status == 'failed',
+        ImportJob.finished_at < datetime.now() - timedelta(days=days)
+    )
+    removed = 0
+    for job in expired:
+        if os.path.exists(job.file_path):
+            os.remove(job.file_path)
+            removed += 1
+    if removed:
+        print(f"🧹 Removed {removed} expired uploads of failed imports")
+    return removed
+
+
+def recover_orphaned_jobs(app):
+    """Requeue running jobs whose process stopped beating, then submit every queued job.
+
+    Run once per web worker (see app.ensure_import_queue), which also
+    expires old failed uploads. A job submitted by more than one worker
+    still runs once, since only one claim wins. Returns the submitted job
+    ids.
+    """
+    expire_failed_uploads(app)
+    interval = app.config.get('IMPORT_HEARTBEAT_SECONDS', 30)
+    stale_before = datetime.now() - timedelta(seconds=STALE_BEATS * interval)
+    requeued = ImportJob.query.filter(
+        ImportJob.status == 'running',
+        db.func.coalesce(ImportJob.heartbeat_at, ImportJob.started_at) < stale_before
+    ).update({ImportJob.status: 'queued'}, synchronize_session=False)
+    db.session.commit()
+    if requeued:
+        print(f"🔁 Requeued {requeued} orphaned import jobs")
+
+    job_ids = [
+        job_id for (job_id,) in
+        db.session.query(ImportJob.id).filter(ImportJob.status == 'queued').order_by(ImportJob.id)
+    ]
+    for job_id in job_ids:
+        _submit(app, job_id)
+    return job_ids
+
+
+def _submit(app, job_id):
+    global _executor
+    workers = app.config.get('IMPORT_WORKERS', 2)
+    try:
+        future = get_executor(app, workers).submit(run_import_job, job_id)
+    except BrokenProcessPool:
+        # A crashed worker poisons the whole pool; start a fresh one
+        with _executor_lock:
+            _executor = None
+        future = get_executor(app, workers).submit(run_import_job, job_id)
+    future.add_done_callback(lambda f: _on_job_finished(app, job_id, f))
+
+
+def _on_job_finished(app, job_id, future):
+    # run_import_job records its own failures; this only catches the pool
+    # itself dying (e.g. a worker killed by the OOM killer)
+    error = future.exception()
+    with app.app_context():
+        if error is not None:
+            _mark_failed(job_id, f"Worker crashed: {error}")
+        _invalidate_cached_results(app, job_id)
+        try:
+            expire_failed_uploads(app)
+        except Exception as e:
+            print(f"⚠️ Expiring failed uploads failed: {e}")
+
+
+def _invalidate_cached_results(app, job_id):
+    # Even a failed job may have committed some chunks
+    cache = app.extensions.get('result_cache')
+    job = ImportJob.query.get(job_id)
+    if cache is not None and job is not None:
+        cache.invalidate_user(job.user_id)
+
+
+def _mark_failed(job_id, message):
+    db.session.rollback()
+    job = ImportJob.query.get(job_id)
+    if job and job.status not in ('completed', 'failed'):
+        job.status = 'failed'
+        job.error = message
+        job.finished_at = datetime.now()
+        db.session.commit()
+
+
+def _claim(job_id):
+    """Move a queued job to running; False if another process got it first"""
+    now = datetime.now()
+    claimed = ImportJob.query.filter_by(id=job_id, status='queued').update({
+        ImportJob.status: 'running',
+        ImportJob.started_at: now,
+        ImportJob.heartbeat_at: now
+    }, synchronize_session=False)
+    db.session.commit()
+    return claimed == 1
+
+
+class _Heartbeat(threading.Thread):
+    """Touches a running job's heartbeat_at every interval seconds.
+
+    Uses its own connection, so beats keep coming while the import is
+    busy in a long step such as parsing a PDF.
+    """
+
+    def __init__(self, app, job_id, interval):
+        super().__init__(name=f'import-heartbeat-{job_id}', daemon=True)
+        self.app = app
+        self.job_id = job_id
+        self.interval = interval
+        self._stopped = threading.Event()
+
+    def run(self):
+        table = ImportJob.__table__
+        while not self._stopped.wait(self.interval):
+            try:
+                with self.app.app_context(), db.engine.begin() as conn:
+                    conn.execute(update(table).where(table.c.id == self.job_id).values(
+                        heartbeat_at=datetime.now()
+                    ))
+            except Exception as e:
+                print(f"⚠️ Heartbeat for import {self.job_id} failed: {e}")
+
+    def stop(self):
+        self._stopped.set()
+
+
+def run_import_job(job_id):
+    """Entry point executed inside a pool worker process"""
+    # Imported here so the web process does not need the PDF/ML stack
+    # loaded just to enqueue a job
+    from transaction_processor import TransactionProcessor
+
+    app = _app
+    if app is None:
+        # Called outside the pool, e.g. from a shell
+        from app import create_app
+        app = create_app()
+
+    with app.app_context():
+        if not _claim(job_id):
+            # Gone, finished, or claimed by a pool process of another worker
+            print(f"⚠️ Import job {job_id} is not queued; skipping")
+            return
+        job = ImportJob.query.get(job_id)
+
+        file_path = job.file_path
+        # A resumed job carries on after the rows its last run committed
+        start_row = job.processed_rows or 0
+        base_imported = job.imported_count or 0
+        base_skipped = job.skipped_count or 0
+        base_duplicates = job.duplicate_count or 0
+
+        def update_progress(**fields):
+            if 'imported_count' in fields:
+                fields['imported_count'] += base_imported
+            if 'skipped_count' in fields:
+                fields['skipped_count'] += base_skipped
+            if 'duplicate_count' in fields:
+                fields['duplicate_count'] += base_duplicates
+            for name, value in fields.items():
+                setattr(job, name, value)
+            db.session.commit()
+
+        heartbeat = _Heartbeat(app, job_id, app.config.get('IMPORT_HEARTBEAT_SECONDS', 30))
+        heartbeat.start()
+        try:
+            # The same files warm_classifier loaded, so the registry already holds them
+            processor = TransactionProcessor(
+                model_path=app.config.get('MODEL_PATH'),
+                encoder_path=app.config.get('ENCODER_PATH'),
+                backend=app.config.get('MODEL_BACKEND')
+            )
+            count = processor.process_uploaded_file(
+                user_id=job.user_id,
+                file_path=file_path,
+                file_type=job.file_type,
+                progress_callback=update_progress,
+                chunksize=app.config.get('IMPORT_CHUNKSIZE', 5000),
+                start_row=start_row,
+                batch_size=app.config.get('IMPORT_BATCH_SIZE', 1000)
+            )
+            job.status = 'completed'
+            job.stage = None
+            job.imported_count = base_imported + count
+            job.finished_at = datetime.now()
+            db.session.commit()
+        except Exception as e:
+            traceback.print_exc()
+            # The upload is kept so the job can be resumed, until
+            # expire_failed_uploads removes it
+            _mark_failed(job_id, str(e))
+            return
+        finally:
+            heartbeat.stop()
+
+        if os.path.exists(file_path):
+            os.remove(file_path)
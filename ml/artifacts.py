@@ -0,0 +1,288 @@
+import json
+import os
+import shutil
+from collections import Counter
+import numpy as np
+
+# A forest artifact is a directory of .npy arrays plus meta.json. Every
+# array is opened with np.load(mmap_mode='r'), so loading only maps the
+# files: pages are read on first use and shared through the page cache by
+# every process that opens the same artifact.
+FORMAT = 'spendsense-forest'
+VERSION = 1
+META_FILE = 'meta.json'
+
+# Rows featurized and pushed through the trees at a time
+BLOCK_ROWS = 1024
+
+
+def is_artifact(path):
+    return os.path.isfile(os.path.join(path, META_FILE))
+
+
+def _is_passthrough(transformer):
+    # A fitted ColumnTransformer swaps 'passthrough' for an identity FunctionTransformer
+    from sklearn.preprocessing import FunctionTransformer
+
+    if isinstance(transformer, str):
+        return transformer == 'passthrough'
+    return isinstance(transformer, FunctionTransformer) and transformer.func is None
+
+
+def _feature_blocks(preprocessor):
+    """Describe the fitted ColumnTransformer as plain JSON-able blocks, in output column order"""
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.preprocessing import OneHotEncoder
+
+    blocks, arrays = [], {}
+    for name, transformer, columns in preprocessor.transformers_:
+        if isinstance(transformer, str) and transformer == 'drop':
+            continue
+        column = columns if isinstance(columns, str) else columns[0]
+        if isinstance(transformer, TfidfVectorizer):
+            terms = np.array(sorted(transformer.vocabulary_), dtype=str)
+            arrays[f'{name}_terms'] = terms
+            arrays[f'{name}_columns'] = np.array(
+                [transformer.vocabulary_[term] for term in terms], dtype=np.int32
+            )
+            arrays[f'{name}_idf'] = np.asarray(transformer.idf_, dtype=np.float64)
+            blocks.append({
+                'name': name, 'kind': 'tfidf', 'column': column,
+                'width': len(terms),
+                'analyzer': transformer.analyzer,
+                'ngram_range': list(transformer.ngram_range),
+                'lowercase': transformer.lowercase,
+                'token_pattern': transformer.token_pattern,
+                'stop_words': transformer.stop_words,
+                'strip_accents': transformer.strip_accents,
+                'binary': transformer.binary,
+                'sublinear_tf': transformer.sublinear_tf,
+                'use_idf': transformer.use_idf,
+                'norm': transformer.norm
+            })
+        elif isinstance(transformer, OneHotEncoder):
+            categories = [str(c) for c in transformer.categories_[0]]
+            blocks.append({
+                'name': name, 'kind': 'onehot', 'column': column,
+                'width': len(categories), 'categories': categories
+            })
+        elif _is_passthrough(transformer):
+            blocks.append({'name': name, 'kind': 'passthrough', 'column': column, 'width': 1})
+        else:
+            raise ValueError(f"Unsupported transformer for artifact export: {name} ({transformer!r})")
+    return blocks, arrays
+
+
+def save_forest_artifact(model, directory, labels=None):
+    """Write a fitted Pipeline(pre=ColumnTransformer, clf=forest) as a memmap artifact.
+
+    labels, when given, are the LabelEncoder classes (stored in meta.json
+    for reference). The directory is written next to the target and
+    swapped in, so a running process never sees a half-written artifact.
+    """
+    preprocessor = model.named_steps['pre']
+    forest = model.named_steps['clf']
+    blocks, arrays = _feature_blocks(preprocessor)
+    n_features = sum(block['width'] for block in blocks)
+
+    # Only features some split uses are materialized at predict time
+    used = np.unique(np.concatenate([
+        tree.tree_.feature[tree.tree_.feature >= 0] for tree in forest.estimators_
+    ] or [np.array([], dtype=np.intp)]))
+    feature_slot = np.full(n_features, -1, dtype=np.int32)
+    feature_slot[used] = np.arange(len(used), dtype=np.int32)
+
+    lefts, rights, features, thresholds, values, offsets = [], [], [], [], [], [0]
+    max_depth = 0
+    for tree in forest.estimators_:
+        t = tree.tree_
+        base = offsets[-1]
+        leaf = t.children_left < 0
+        lefts.append(np.where(leaf, -1, t.children_left + base))
+        rights.append(np.where(leaf, -1, t.children_right + base))
+        features.append(np.where(leaf, -1, feature_slot[np.maximum(t.feature, 0)]))
+        thresholds.append(t.threshold)
+        value = t.value[:, 0, :].astype(np.float64)
+        totals = value.sum(axis=1, keepdims=True)
+        values.append(value / np.where(totals > 0, totals, 1))
+        offsets.append(base + t.node_count)
+        max_depth = max(max_depth, t.max_depth)
+
+    arrays.update({
+        'feature_slot': feature_slot,
+        'tree_left': np.concatenate(lefts).astype(np.int32),
+        'tree_right': np.concatenate(rights).astype(np.int32),
+        'tree_feature': np.concatenate(features).astype(np.int32),
+        'tree_threshold': np.concatenate(thresholds).astype(np.float64),
+        'tree_value': np.concatenate(values).astype(np.float64),
+        'tree_offsets': np.asarray(offsets, dtype=np.int64)
+    })
+    meta = {
+        'format': FORMAT,
+        'version': VERSION,
+        'blocks': blocks,
+        'n_features': n_features,
+        'n_used_features': int(len(used)),
+        'n_trees': len(forest.estimators_),
+        'max_depth': int(max_depth),
+        'classes': [int(c) for c in forest.classes_],
+        'labels': [str(label) for label in labels] if labels is not None else None
+    }
+
+    directory = os.path.abspath(directory)
+    staging = directory + '.tmp'
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+    for name, array in arrays.items():
+        np.save(os.path.join(staging, f'{name}.npy'), array)
+    with open(os.path.join(staging, META_FILE), 'w') as f:
+        json.dump(meta, f, indent=2)
+
+    retired = directory + '.old'
+    shutil.rmtree(retired, ignore_errors=True)
+    if os.path.exists(directory):
+        os.rename(directory, retired)
+    os.rename(staging, directory)
+    shutil.rmtree(retired, ignore_errors=True)
+    return directory
+
+
+class ForestArtifact:
+    """Random forest predictor over a memory-mapped artifact.
+
+    Accepts the same DataFrame as the pickled Pipeline and returns the same
+    encoded classes. All trees are walked together for a block of rows:
+    each step gathers every (row, tree) node's feature, compares against
+    its threshold and moves to a child, for max_depth steps at most.
+    Leaf probabilities are float64 and summed tree by tree as sklearn does,
+    so even exact ties between classes resolve the same as the pickle.
+    """
+
+    def __init__(self, directory):
+        with open(os.path.join(directory, META_FILE)) as f:
+            self.meta = json.load(f)
+        if self.meta.get('format') != FORMAT:
+            raise ValueError(f"{directory} is not a {FORMAT} artifact")
+
+        def load(name):
+            return np.load(os.path.join(directory, f'{name}.npy'), mmap_mode='r')
+
+        self.blocks = self.meta['blocks']
+        self.vocab = {
+            block['name']: (load(f"{block['name']}_terms"), load(f"{block['name']}_columns"), load(f"{block['name']}_idf"))
+            for block in self.blocks if block['kind'] == 'tfidf'
+        }
+        self.feature_slot = load('feature_slot')
+        self.left = load('tree_left')
+        self.right = load('tree_right')
+        self.feature = load('tree_feature')
+        self.threshold = load('tree_threshold')
+        self.value = load('tree_value')
+        self.offsets = load('tree_offsets')
+        self.classes_ = np.asarray(self.meta['classes'])
+        self._analyzers = {}
+
+    def _analyzer(self, block):
+        analyzer = self._analyzers.get(block['name'])
+        if analyzer is None:
+            from sklearn.feature_extraction.text import TfidfVectorizer
+
+            analyzer = TfidfVectorizer(
+                analyzer=block['analyzer'],
+                ngram_range=tuple(block['ngram_range']),
+                lowercase=block['lowercase'],
+                token_pattern=block['token_pattern'],
+                stop_words=block.get('stop_words'),
+                strip_accents=block.get('strip_accents')
+            ).build_analyzer()
+            self._analyzers[block['name']] = analyzer
+        return analyzer
+
+    def _tfidf_row(self, block, document):
+        """(columns, values) of one document's tf-idf vector within its block"""
+        terms, columns, idf = self.vocab[block['name']]
+        counts = Counter(self._analyzer(block)(document))
+        if not counts or len(terms) == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+
+        tokens = np.array(list(counts), dtype=str)
+        positions = np.minimum(np.searchsorted(terms, tokens), len(terms) - 1)
+        known = terms[positions] == tokens
+        if not known.any():
+            return np.empty(0, dtype=np.int64), np.empty(0)
+
+        cols = np.asarray(columns[positions[known]], dtype=np.int64)
+        tf = np.array([counts[t] for t in tokens[known]], dtype=np.float64)
+        if block['binary']:
+            tf = np.ones_like(tf)
+        elif block['sublinear_tf']:
+            tf = np.log(tf) + 1
+        if block['use_idf']:
+            tf = tf * idf[cols]
+        if block['norm'] == 'l2':
+            tf = tf / np.sqrt((tf ** 2).sum())
+        elif block['norm'] == 'l1':
+            tf = tf / np.abs(tf).sum()
+        return cols, tf
+
+    def transform(self, X):
+        """Dense float32 matrix of just the features the trees split on"""
+        n_rows = len(X)
+        out = np.zeros((n_rows, self.meta['n_used_features']), dtype=np.float32)
+        start = 0
+        for block in self.blocks:
+            values = X[block['column']].tolist()
+            if block['kind'] == 'tfidf':
+                for row, document in enumerate(values):
+                    cols, weights = self._tfidf_row(block, document)
+                    self._scatter(out, row, start + cols, weights)
+            elif block['kind'] == 'onehot':
+                position = {category: i for i, category in enumerate(block['categories'])}
+                for row, value in enumerate(values):
+                    i = position.get(str(value))
+                    if i is not None:
+                        self._scatter(out, row, np.array([start + i]), np.array([1.0]))
+            else:
+                slot = self.feature_slot[start]
+                if slot >= 0:
+                    out[:, slot] = np.asarray(values, dtype=np.float64)
+            start += block['width']
+        return out
+
+    def _scatter(self, out, row, columns, weights):
+        slots = self.feature_slot[columns]
+        keep = slots >= 0
+        out[row, slots[keep]] = weights[keep]
+
+    def predict_proba(self, X):
+        probabilities = []
+        for begin in range(0, len(X), BLOCK_ROWS):
+            features = self.transform(X.iloc[begin:begin + BLOCK_ROWS])
+            probabilities.append(self._walk(features))
+        if not probabilities:
+            return np.zeros((0, len(self.classes_)))
+        return np.concatenate(probabilities)
+
+    def predict(self, X):
+        return self.classes_.take(self.predict_proba(X).argmax(axis=1))
+
+    def _walk(self, features):
+        n_rows = features.shape[0]
+        rows = np.arange(n_rows)[:, None]
+        nodes = np.broadcast_to(self.offsets[:-1], (n_rows, len(self.offsets) - 1)).copy()
+        for _ in range(self.meta['max_depth']):
+            feature = self.feature[nodes]
+            internal = feature >= 0
+            if not internal.any():
+                break
+            # sklearn compares the float32 feature against a float64 threshold
+            go_left = features[rows, np.where(internal, feature, 0)] <= self.threshold[nodes]
+            nodes = np.where(internal, np.where(go_left, self.left[nodes], self.right[nodes]), nodes)
+        proba = np.zeros((n_rows, self.value.shape[1]))
+        for tree in range(nodes.shape[1]):
+            proba += self.value[nodes[:, tree]]
+        return proba / nodes.shape[1]
+
+
+def load_artifact(directory):
+    return ForestArtifact(directory)
@@ -0,0 +1,89 @@
+import os
+
+# Classifier backends model.py can train and the predictor can serve.
+#   forest          100-tree RandomForest on word TF-IDF (the original model)
+#   shallow_forest  30 trees capped at depth 30 / 2-sample leaves: a fraction
+#                   of the size and latency of the full forest
+#   sgd             linear SVM-style model trained with SGD
+#   logreg          multinomial logistic regression (calibrated probabilities)
+#   sgd_stream      SGD over hashed features, trained out of core by
+#                   `model.py --stream` (see ml/streaming.py)
+BACKENDS = ('forest', 'shallow_forest', 'sgd', 'logreg', 'sgd_stream')
+DEFAULT_BACKEND = 'forest'
+FOREST_BACKENDS = ('forest', 'shallow_forest')
+# Trained on their own data stream, so they get their own label encoder
+STREAM_BACKENDS = ('sgd_stream',)
+
+
+def current_backend():
+    """Backend selected by SPENDSENSE_MODEL_BACKEND (default: forest)"""
+    backend = os.environ.get('SPENDSENSE_MODEL_BACKEND', DEFAULT_BACKEND)
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown model backend: {backend}")
+    return backend
+
+
+def model_path(backend):
+    # The default backend keeps the original file name
+    if backend == DEFAULT_BACKEND:
+        return 'transaction_classifier.pkl'
+    return f'transaction_classifier_{backend}.pkl'
+
+
+def encoder_path(backend):
+    # In-memory backends are trained together on one split and share the
+    # original encoder file
+    if backend in STREAM_BACKENDS:
+        return f'label_encoder_{backend}.pkl'
+    return 'label_encoder.pkl'
+
+
+def artifact_path(backend):
+    """Memmap artifact directory; only forest backends have one"""
+    if backend not in FOREST_BACKENDS:
+        return None
+    if backend == DEFAULT_BACKEND:
+        return 'transaction_classifier.artifact'
+    return f'transaction_classifier_{backend}.artifact'
+
+
+def default_text_features(backend):
+    # Linear models gain the most from character n-grams; the forests keep
+    # the original word features unless asked otherwise
+    return 'word' if backend in FOREST_BACKENDS else 'word+char'
+
+
+def build_pipeline(backend, text_features=None, n_jobs=None, random_state=42):
+    """Unfitted Pipeline(pre, clf) for a backend"""
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.linear_model import LogisticRegression, SGDClassifier
+    from sklearn.pipeline import Pipeline
+    from ml.features import build_hashing_preprocessor, build_preprocessor
+
+    if backend == 'sgd_stream':
+        return Pipeline(steps=[
+            ('pre', build_hashing_preprocessor()),
+            ('clf', SGDClassifier(loss='modified_huber', alpha=1e-6, random_state=random_state, n_jobs=n_jobs))
+        ])
+
+    text_features = text_features or default_text_features(backend)
+    if backend == 'forest':
+        clf = RandomForestClassifier(n_estimators=100, random_state=random_state, n_jobs=n_jobs)
+    elif backend == 'shallow_forest':
+        clf = RandomForestClassifier(
+            n_estimators=30, max_depth=30, min_samples_leaf=2,
+            random_state=random_state, n_jobs=n_jobs
+        )
+    elif backend == 'sgd':
+        clf = SGDClassifier(loss='modified_huber', alpha=1e-5, max_iter=50, tol=1e-4,
+                            random_state=random_state, n_jobs=n_jobs)
+    elif backend == 'logreg':
+        clf = LogisticRegression(C=10.0, max_iter=1000)
+    else:
+        raise ValueError(f"Unknown model backend: {backend}")
+
+    amount = 'passthrough' if backend in FOREST_BACKENDS else 'signed_log'
+    return Pipeline(steps=[
+        ('pre', build_preprocessor(text_features, amount=amount)),
+        ('clf', clf)
+    ])
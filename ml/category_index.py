@@ -0,0 +1,116 @@
+from models import db, Category
+
+
+def _normalize(name):
+    return str(name).strip().lower()
+
+
+class CategoryIndex:
+    """Resolves predicted label names to a user's category ids.
+
+    Built with one query per ingestion batch. Exact names and the
+    substring aliases the predictor used to scan for row by row are
+    memoized, so each distinct label is matched once and every further
+    lookup is a dict hit. Categories that do not exist yet are queued and
+    inserted together by flush().
+    """
+
+    def __init__(self, user_id, categories, known_labels=()):
+        self.user_id = user_id
+        self._names = []
+        self._exact = {}
+        self._aliases = {}
+        self._pending = {}
+        for cat in categories:
+            self._add(cat)
+
+        # Labels the encoder can emit are resolved up front so a batch
+        # only ever does dict lookups
+        for label in known_labels:
+            self._lookup(label)
+
+    @classmethod
+    def build(cls, user_id, known_labels=()):
+        categories = Category.query.filter(
+            (Category.user_id == user_id) | (Category.is_default == True)
+        ).all()
+        return cls(user_id, categories, known_labels)
+
+    def _add(self, category):
+        key = _normalize(category.name)
+        self._names.append((key, category.id))
+        # Keep the first category seen for a name, as the old linear scan did
+        self._exact.setdefault(key, category.id)
+
+    def _lookup(self, label, allow_partial=True):
+        key = _normalize(label)
+        if key in self._exact:
+            return self._exact[key]
+        if not allow_partial:
+            return None
+        if key in self._aliases:
+            return self._aliases[key]
+
+        match = None
+        for name, category_id in self._names:
+            if key in name or name in key:
+                match = category_id
+                break
+        self._aliases[key] = match
+        return match
+
+    def resolve_many(self, labels, income_flags, allow_partial=True):
+        """Map labels to category ids, creating any missing categories in one insert"""
+        labels = [str(label).strip() for label in labels]
+        income_flags = list(income_flags)
+
+        category_ids = []
+        for label, is_income in zip(labels, income_flags):
+            category_id = self._lookup(label, allow_partial)
+            if category_id is None:
+                self._pending.setdefault(_normalize(label), (label, is_income))
+            category_ids.append(category_id)
+
+        if self._pending:
+            self.flush()
+            category_ids = [
+                category_id if category_id is not None else self._lookup(label, allow_partial)
+                for category_id, label in zip(category_ids, labels)
+            ]
+        return category_ids
+
+    def default_ids(self, income_flags):
+        """Ids of the 'Other' / 'Other Income' fallbacks for each row"""
+        labels = ['Other Income' if is_income else 'Other' for is_income in income_flags]
+        return self.resolve_many(labels, income_flags, allow_partial=False)
+
+    def flush(self):
+        """Insert all queued categories in a single commit"""
+        if not self._pending:
+            return
+
+        new_categories = [
+            Category(
+                user_id=self.user_id,
+                name=name,
+                color='#808080' if _normalize(name) in ('other', 'other income') else '#3B82F6',
+                icon='tag',
+                is_income=is_income
+            )
+            for name, is_income in self._pending.values()
+        ]
+        self._pending = {}
+
+        try:
+            db.session.add_all(new_categories)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            print(f"⚠️ Failed to create predicted categories: {str(e)}")
+            return
+
+        print(f"🆕 Created {len(new_categories)} categories: {[c.name for c in new_categories]}")
+        # New names may now satisfy aliases that previously had no match
+        self._aliases = {k: v for k, v in self._aliases.items() if v is not None}
+        for category in new_categories:
+            self._add(category)
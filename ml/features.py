@@ -0,0 +1,68 @@
+import numpy as np
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.compose import ColumnTransformer
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfVectorizer
+from sklearn.preprocessing import OneHotEncoder
+
+# Description features: word tokens, character n-grams within word
+# boundaries (robust to merchant codes like "AMZN MKTP US*2K4"), or both
+TEXT_FEATURES = ('word', 'char', 'word+char')
+
+
+class SignedLogAmount(BaseEstimator, TransformerMixin):
+    """sign(x) * log1p(|x|): keeps the sign of the amount and squashes its
+    range so a linear model's weight on it is not dominated by outliers"""
+
+    def fit(self, X, y=None):
+        return self
+
+    def transform(self, X):
+        values = np.asarray(X, dtype=np.float64)
+        return np.sign(values) * np.log1p(np.abs(values))
+
+
+def build_preprocessor(text_features='word', amount='passthrough'):
+    """ColumnTransformer over Description / Type / Amount.
+
+    amount is 'passthrough' (trees split on raw values) or 'signed_log'
+    (for linear models). Forests keep 'passthrough' so they can still be
+    exported as memmap artifacts.
+    """
+    if text_features not in TEXT_FEATURES:
+        raise ValueError(f"Unknown text features: {text_features}")
+
+    transformers = []
+    if text_features in ('word', 'word+char'):
+        transformers.append(('desc', TfidfVectorizer(), 'Description'))
+    if text_features in ('char', 'word+char'):
+        transformers.append((
+            'desc_char',
+            TfidfVectorizer(analyzer='char_wb', ngram_range=(2, 4), min_df=2, sublinear_tf=True),
+            'Description'
+        ))
+    transformers.append(('type', OneHotEncoder(handle_unknown='ignore'), ['Type']))
+    transformers.append((
+        'amount',
+        SignedLogAmount() if amount == 'signed_log' else 'passthrough',
+        ['Amount']
+    ))
+    return ColumnTransformer(transformers=transformers)
+
+
+def build_hashing_preprocessor(n_features=2 ** 18):
+    """Stateless ColumnTransformer for out-of-core training.
+
+    Every step hashes or computes its output without a fitted vocabulary,
+    so the feature space is fixed up front and chunks can be streamed
+    through partial_fit. Type is hashed too (case-insensitive) instead of
+    one-hot encoded against categories seen in a fit. n_features is per
+    text block; a linear model holds n_features * 2 weights per class.
+    """
+    return ColumnTransformer(transformers=[
+        ('desc', HashingVectorizer(n_features=n_features, alternate_sign=False), 'Description'),
+        ('desc_char', HashingVectorizer(
+            analyzer='char_wb', ngram_range=(2, 4), n_features=n_features, alternate_sign=False
+        ), 'Description'),
+        ('type', HashingVectorizer(n_features=16, token_pattern=r'\w+', alternate_sign=False, norm=None), 'Type'),
+        ('amount', SignedLogAmount(), ['Amount'])
+    ])
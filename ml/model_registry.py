@@ -0,0 +1,133 @@
+import os
+import threading
+import time
+
+
+def _current_rss_bytes():
+    """Resident set size of this process, or None where /proc is unavailable"""
+    try:
+        with open('/proc/self/statm') as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class _LoadedArtifact:
+    def __init__(self, obj, mtime, load_seconds, file_bytes, rss_delta_bytes):
+        self.obj = obj
+        self.mtime = mtime
+        self.load_seconds = load_seconds
+        self.file_bytes = file_bytes
+        self.rss_delta_bytes = rss_delta_bytes
+        self.loaded_at = time.time()
+        self.hits = 0
+
+
+class ModelRegistry:
+    """Process-wide cache of model artifacts.
+
+    Each path is loaded once per process and shared by every caller. A
+    file is unpickled with joblib; a directory is opened as a memory-mapped
+    forest artifact (ml.artifacts).
+    The file mtime is re-checked on every lookup (a single stat call) so a
+    retrained model dropped in place is picked up without a restart.
+    """
+
+    def __init__(self):
+        self._artifacts = {}
+        self._lock = threading.Lock()
+        self._path_locks = {}
+        self.reloads = 0
+
+    def get(self, path):
+        """Return the loaded object for path, loading or reloading it if needed"""
+        path = os.path.abspath(path)
+        mtime = os.stat(path).st_mtime
+
+        entry = self._artifacts.get(path)
+        if entry is not None and entry.mtime == mtime:
+            entry.hits += 1
+            return entry.obj
+
+        # One lock per path so a slow load of one artifact does not block
+        # lookups of another that is already warm
+        with self._lock:
+            path_lock = self._path_locks.setdefault(path, threading.Lock())
+
+        with path_lock:
+            # Another thread may have finished the load while we waited
+            entry = self._artifacts.get(path)
+            if entry is not None and entry.mtime == mtime:
+                entry.hits += 1
+                return entry.obj
+
+            entry = self._load(path, mtime)
+            if path in self._artifacts:
+                self.reloads += 1
+                print(f"🔄 Reloaded {os.path.basename(path)} (file changed)")
+            self._artifacts[path] = entry
+            return entry.obj
+
+    def _load(self, path, mtime):
+        rss_before = _current_rss_bytes()
+        started = time.perf_counter()
+        if os.path.isdir(path):
+            from ml.artifacts import load_artifact
+
+            obj = load_artifact(path)
+            file_bytes = sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+        else:
+            import joblib  # only processes that actually load a model pay for it
+
+            obj = joblib.load(path)
+            file_bytes = os.path.getsize(path)
+        load_seconds = time.perf_counter() - started
+        rss_after = _current_rss_bytes()
+
+        rss_delta = None
+        if rss_before is not None and rss_after is not None:
+            rss_delta = max(0, rss_after - rss_before)
+
+        print(f"📦 Loaded {os.path.basename(path)} in {load_seconds * 1000:.1f} ms")
+        return _LoadedArtifact(
+            obj=obj,
+            mtime=mtime,
+            load_seconds=load_seconds,
+            file_bytes=file_bytes,
+            rss_delta_bytes=rss_delta
+        )
+
+    def invalidate(self, path=None):
+        """Drop one cached artifact, or all of them when path is None"""
+        with self._lock:
+            if path is None:
+                self._artifacts.clear()
+            else:
+                self._artifacts.pop(os.path.abspath(path), None)
+
+    def stats(self):
+        """Load-time and memory figures for every artifact currently held.
+
+        Artifacts are keyed by file name only: this is served to users by
+        /model-stats and must not reveal server paths.
+        """
+        return {
+            'reloads': self.reloads,
+            'process_rss_bytes': _current_rss_bytes(),
+            'artifacts': {
+                os.path.basename(path): {
+                    'load_seconds': round(entry.load_seconds, 4),
+                    'file_bytes': entry.file_bytes,
+                    'rss_delta_bytes': entry.rss_delta_bytes,
+                    'loaded_at': entry.loaded_at,
+                    'mtime': entry.mtime,
+                    'hits': entry.hits
+                }
+                for path, entry in list(self._artifacts.items())
+            }
+        }
+
+
+# Shared by every CategoryPredictor in this process
+registry = ModelRegistry()
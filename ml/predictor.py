@@ -1,106 +1,91 @@
-import joblib
 import pandas as pd
-from models import db, Category
+from ml.artifacts import is_artifact
+from ml.backends import artifact_path, current_backend, encoder_path as backend_encoder_path
+from ml.backends import model_path as backend_model_path
+from ml.category_index import CategoryIndex
+from ml.model_registry import registry
+
+
+def resolve_model_path(model_path=None, backend=None):
+    """The explicit path, else the backend's memmap artifact when present, else its pickle.
+
+    backend defaults to SPENDSENSE_MODEL_BACKEND (see ml.backends).
+    """
+    if model_path:
+        return model_path
+    backend = backend or current_backend()
+    artifact = artifact_path(backend)
+    if artifact and is_artifact(artifact):
+        return artifact
+    return backend_model_path(backend)
+
+
+def resolve_encoder_path(encoder_path=None, backend=None):
+    """The explicit path, else the label encoder the backend was trained with"""
+    return encoder_path or backend_encoder_path(backend or current_backend())
+
 
 class CategoryPredictor:
-    def __init__(self, model_path='transaction_classifier.pkl'):
+    def __init__(self, model_path=None, encoder_path=None, backend=None):
+        model_path = resolve_model_path(model_path, backend)
+        encoder_path = resolve_encoder_path(encoder_path, backend)
         try:
-            self.model = joblib.load(model_path)
+            # Both artifacts come from the process-wide registry, so only the
+            # first predictor in a process pays the deserialization cost
+            self.model = registry.get(model_path)
             # Also load the label encoder that was used during training
-            self.label_encoder = joblib.load('label_encoder.pkl')  # You'll need to save this
+            self.label_encoder = registry.get(encoder_path)
         except Exception as e:
             print(f"⚠️ Failed to load model: {str(e)}")
             self.model = None
             self.label_encoder = None
 
-    def predict_for_user(self, user_id, description, amount, is_income=False):
+    def predict_batch(self, user_id, descriptions, amounts, types, category_index=None):
+        """Classify a whole statement with one pipeline pass.
+
+        descriptions, amounts and types are parallel sequences; types holds
+        'credit' / 'debit'. Returns a list of category ids in the same order.
+        Pass a CategoryIndex to reuse it across several batches of one import.
+        """
+        descriptions = list(descriptions)
+        amounts = list(amounts)
+        types = [str(t).lower() for t in types]
+        if not descriptions:
+            return []
+
+        income_flags = [t == 'credit' for t in types]
+        if category_index is None:
+            category_index = self.build_category_index(user_id)
+
         if not self.model or not self.label_encoder:
-            return self._get_default_category(user_id, is_income)
+            return category_index.default_ids(income_flags)
 
         try:
-            # Create DataFrame in the EXACT format your model expects
-            # Based on your training data: Description (lowercase), Amount (float), Type (uppercase)
             input_data = pd.DataFrame({
-                'Description': [description.lower().strip()],
-                'Amount': [float(amount)],
-                'Type': ['CREDIT' if is_income else 'DEBIT']  # Match training data format
+                'Description': pd.Series(descriptions, dtype=str).str.lower().str.strip(),
+                'Amount': pd.Series(amounts, dtype=float),
+                'Type': ['CREDIT' if is_income else 'DEBIT' for is_income in income_flags]
             })
-            
-            print(f"🔍 Model input: {input_data.to_dict('records')[0]}")
-
-            # Get prediction (this returns encoded labels)
-            prediction_encoded = self.model.predict(input_data)[0]
-            
-            # Decode the prediction back to category name
-            predicted_category = self.label_encoder.inverse_transform([prediction_encoded])[0]
-            
-            print(f"🎯 Predicted category: '{predicted_category}' for '{description[:50]}...'")
-
-            # Find matching category for this user
-            user_categories = Category.query.filter(
-                (Category.user_id == user_id) | (Category.is_default == True)
-            ).all()
-
-            print(f"📋 Available categories: {[cat.name for cat in user_categories]}")
-
-            # Try exact match first
-            for cat in user_categories:
-                if predicted_category.lower() == cat.name.lower():
-                    print(f"✅ Exact match found: {cat.name}")
-                    return cat.id
-
-            # Try partial match
-            for cat in user_categories:
-                if (predicted_category.lower() in cat.name.lower() or 
-                    cat.name.lower() in predicted_category.lower()):
-                    print(f"✅ Partial match found: {cat.name} (predicted: {predicted_category})")
-                    return cat.id
-
-            # If no match, create the predicted category for this user
-            print(f"🆕 Creating new category: {predicted_category}")
-            return self._create_predicted_category(user_id, predicted_category, is_income)
 
+            # One predict and one inverse_transform for the whole batch
+            predicted = self.label_encoder.inverse_transform(self.model.predict(input_data))
+            print(f"🎯 Predicted {len(predicted)} categories in one batch")
         except Exception as e:
-            print(f"❌ Prediction failed: {str(e)}")
-            return self._get_default_category(user_id, is_income)
+            print(f"❌ Batch prediction failed: {str(e)}")
+            return category_index.default_ids(income_flags)
 
-    def _create_predicted_category(self, user_id, category_name, is_income):
-        """Create a new category based on model prediction"""
-        try:
-            new_category = Category(
-                user_id=user_id,
-                name=category_name,
-                color='#3B82F6',  # Default blue
-                icon='tag',
-                is_income=is_income
-            )
-            db.session.add(new_category)
-            db.session.commit()
-            return new_category.id
-        except Exception as e:
-            print(f"⚠️ Failed to create predicted category: {str(e)}")
-            return self._get_default_category(user_id, is_income)
-
-    def _get_default_category(self, user_id, is_income):
-        default_name = 'Other Income' if is_income else 'Other'
-        default = Category.query.filter(
-            (Category.user_id == user_id) | (Category.is_default == True),
-            (Category.name.ilike(default_name))
-        ).first()
-
-        if not default:
-            try:
-                default = Category(
-                    user_id=user_id,
-                    name=default_name,
-                    color='#808080',
-                    icon='tag',
-                    is_income=is_income
-                )
-                db.session.add(default)
-                db.session.commit()
-            except Exception as e:
-                print(f"⚠️ Failed to create default category: {str(e)}")
-                return None
-
-        return default.id if default else None
\ No newline at end of file
+        return category_index.resolve_many(predicted, income_flags)
+
+    def build_category_index(self, user_id):
+        """Category lookup for one ingestion batch, pre-seeded with every label the model can emit"""
+        known_labels = getattr(self.label_encoder, 'classes_', ())
+        return CategoryIndex.build(user_id, known_labels)
+
+    def predict_for_user(self, user_id, description, amount, is_income=False):
+        """Single-row convenience wrapper around predict_batch"""
+        return self.predict_batch(
+            user_id=user_id,
+            descriptions=[description],
+            amounts=[amount],
+            types=['credit' if is_income else 'debit']
+        )[0]
@@ -0,0 +1,159 @@
+"""Out-of-core training for the sgd_stream backend.
+
+The CSV is read in chunks and never held in memory whole. A first pass
+collects the label set (partial_fit needs every class up front) and a
+fixed holdout sample; training passes then feed each remaining chunk
+through the stateless hashing preprocessor into SGDClassifier.partial_fit.
+Progress is checkpointed so an interrupted run can pick up where it
+stopped.
+"""
+import os
+import time
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import LabelEncoder
+from ml.backends import build_pipeline
+
+FEATURES = ['Description', 'Amount', 'Type']
+
+
+def clean_frame(df):
+    """Parse amounts, drop unlabelled or unparseable rows and normalise descriptions"""
+    df = df.copy()
+    df['Amount'] = pd.to_numeric(
+        df['Amount'].astype(str).str.replace(r'[^\d\.-]', '', regex=True),
+        errors='coerce'
+    )
+    df = df.dropna(subset=['Category', 'Amount'])
+    df['Description'] = df['Description'].fillna('').astype(str).str.lower().str.strip()
+    df['Type'] = df['Type'].fillna('').astype(str)
+    return df
+
+
+def holdout_mask(row_numbers, permille):
+    """Rows reserved for evaluation, chosen by a hash of their position in the file
+    so the split is the same on every pass and after a resume"""
+    hashed = pd.util.hash_array(np.asarray(row_numbers, dtype=np.int64))
+    return hashed % 1000 < permille
+
+
+class StreamingTrainer:
+    def __init__(self, data_path, chunksize=100_000, epochs=1, holdout_permille=20,
+                 holdout_cap=200_000, checkpoint_path='sgd_stream.checkpoint',
+                 checkpoint_every=10, n_jobs=None):
+        self.data_path = data_path
+        self.chunksize = chunksize
+        self.epochs = epochs
+        self.holdout_permille = holdout_permille
+        self.holdout_cap = holdout_cap
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_every = checkpoint_every
+        self.n_jobs = n_jobs
+
+    def _chunks(self, skip_rows=0, usecols=None):
+        """(first row number, cleaned chunk) pairs; row numbers count data rows from 0"""
+        skiprows = (lambda i: 0 < i <= skip_rows) if skip_rows else None
+        reader = pd.read_csv(self.data_path, chunksize=self.chunksize, usecols=usecols, skiprows=skiprows)
+        start = skip_rows
+        for chunk in reader:
+            chunk.index = pd.RangeIndex(start, start + len(chunk))
+            start += len(chunk)
+            yield chunk.index[0], clean_frame(chunk)
+
+    def scan(self):
+        """First pass: label encoder, holdout frame and total row count"""
+        labels = set()
+        holdout = []
+        held = 0
+        total = 0
+        for _, chunk in self._chunks(usecols=FEATURES + ['Category']):
+            total = chunk.index[-1] + 1 if len(chunk) else total
+            labels.update(chunk['Category'].unique())
+            if held < self.holdout_cap:
+                sample = chunk[holdout_mask(chunk.index, self.holdout_permille)]
+                sample = sample.iloc[:self.holdout_cap - held]
+                held += len(sample)
+                holdout.append(sample)
+
+        le = LabelEncoder().fit(sorted(labels))
+        holdout = pd.concat(holdout) if holdout else pd.DataFrame(columns=FEATURES + ['Category'])
+        print(f"📊 {len(le.classes_)} categories, {held} holdout rows")
+        return le, holdout, total
+
+    def _fresh_state(self, le):
+        return {
+            'model': build_pipeline('sgd_stream', n_jobs=self.n_jobs),
+            'classes': list(le.classes_),
+            'epoch': 0,
+            'rows_done': 0,
+            'rows_trained': 0,
+            'preprocessor_fitted': False
+        }
+
+    def _save_checkpoint(self, state):
+        # Write beside the target and swap it in, so a crash mid-dump
+        # leaves the previous checkpoint intact
+        tmp_path = f'{self.checkpoint_path}.tmp'
+        joblib.dump(state, tmp_path)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def _load_checkpoint(self, le):
+        state = joblib.load(self.checkpoint_path)
+        if state['classes'] != list(le.classes_):
+            raise ValueError(
+                f"Checkpoint {self.checkpoint_path} was trained on a different label set; "
+                "remove it or run without --resume"
+            )
+        print(f"🔄 Resuming at epoch {state['epoch'] + 1}, row {state['rows_done']}")
+        return state
+
+    def evaluate(self, model, le, holdout):
+        if holdout.empty:
+            return None
+        return float(model.score(holdout[FEATURES], le.transform(holdout['Category'])))
+
+    def run(self, resume=False):
+        """Train to completion; returns (model, label encoder, holdout frame, holdout accuracy)"""
+        le, holdout, total = self.scan()
+        if resume and os.path.exists(self.checkpoint_path):
+            state = self._load_checkpoint(le)
+        else:
+            state = self._fresh_state(le)
+
+        pre = state['model'].named_steps['pre']
+        clf = state['model'].named_steps['clf']
+        classes = np.arange(len(le.classes_))
+
+        while state['epoch'] < self.epochs:
+            started = time.perf_counter()
+            chunks_since_checkpoint = 0
+            for _, chunk in self._chunks(skip_rows=state['rows_done']):
+                if len(chunk):
+                    state['rows_done'] = chunk.index[-1] + 1
+                train = chunk[~holdout_mask(chunk.index, self.holdout_permille)]
+                if len(train):
+                    if not state['preprocessor_fitted']:
+                        # Hashing and amount steps are stateless; fit only sets up the columns
+                        pre.fit(train[FEATURES])
+                        state['preprocessor_fitted'] = True
+                    clf.partial_fit(pre.transform(train[FEATURES]), le.transform(train['Category']),
+                                    classes=classes)
+                    state['rows_trained'] += len(train)
+
+                chunks_since_checkpoint += 1
+                if chunks_since_checkpoint >= self.checkpoint_every:
+                    self._save_checkpoint(state)
+                    chunks_since_checkpoint = 0
+                    print(f"💾 Epoch {state['epoch'] + 1}: {state['rows_done']}/{total} rows")
+
+            state['epoch'] += 1
+            state['rows_done'] = 0
+            self._save_checkpoint(state)
+            accuracy = self.evaluate(state['model'], le, holdout)
+            print(f"✅ Epoch {state['epoch']}/{self.epochs} in {time.perf_counter() - started:.1f}s"
+                  + (f", holdout accuracy {accuracy:.4f}" if accuracy is not None else ""))
+
+        if not state['preprocessor_fitted']:
+            raise ValueError(f"No training rows in {self.data_path}")
+        return state['model'], le, holdout, self.evaluate(state['model'], le, holdout)
@@ -1,58 +1,197 @@
+"""Train the transaction classifier.
+
+Usage:
+    python model.py [--backend forest] [--text-features word|char|word+char]
+    python model.py --backend all --report [--report-path model_report.json]
+    python model.py --stream [--chunksize 100000] [--epochs 1] [--resume]
+
+Backends are defined in ml/backends.py; the predictor serves the one named
+by SPENDSENSE_MODEL_BACKEND. --report trains every selected backend and
+prints accuracy, single-row p50/p99 latency, batch throughput, artifact
+size and load time for each.
+
+--stream trains the sgd_stream backend out of core (ml/streaming.py): the
+CSV is read in chunks, hashed into a fixed feature space and fed to
+SGDClassifier.partial_fit, with a checkpoint every --checkpoint-every
+chunks that --resume continues from.
+"""
+import argparse
+import json
+import os
+import time
+import numpy as np
 import pandas as pd
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import LabelEncoder
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.compose import ColumnTransformer
-from sklearn.pipeline import Pipeline
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.preprocessing import OneHotEncoder
 import joblib
+from ml.artifacts import load_artifact, save_forest_artifact
+from ml.backends import BACKENDS, DEFAULT_BACKEND, artifact_path, build_pipeline, encoder_path, model_path
+from ml.features import TEXT_FEATURES
+from ml.streaming import FEATURES, StreamingTrainer
+
+
+def load_dataset(path):
+    df = pd.read_csv(path)
+
+    # Clean 'Amount' column
+    df['Amount'] = (
+        df['Amount']
+        .astype(str)
+        .str.replace(r'[^\d\.-]', '', regex=True)  # Remove all non-numeric characters (except dot and minus)
+        .astype(float)
+    )
+
+    # Drop rows with missing labels
+    df = df.dropna(subset=['Category'])
+
+    # Clean text
+    df['Description'] = df['Description'].str.lower().str.strip()
+    return df
+
+
+def train_backend(backend, X_train, y_train, text_features=None, n_jobs=None):
+    model = build_pipeline(backend, text_features=text_features, n_jobs=n_jobs)
+    started = time.perf_counter()
+    model.fit(X_train, y_train)
+    print(f"Trained {backend} in {time.perf_counter() - started:.1f}s")
+    return model
+
+
+def save_backend(backend, model, label_encoder):
+    """Write the pickle, the backend's label encoder and, for forest
+    backends, the memmap artifact; returns the paths, pickle first"""
+    paths = [model_path(backend)]
+    joblib.dump(model, paths[0])
+    paths.append(encoder_path(backend))
+    joblib.dump(label_encoder, paths[1])
+    if artifact_path(backend):
+        paths.append(save_forest_artifact(model, artifact_path(backend), labels=label_encoder.classes_))
+    return paths
+
+
+def _size_bytes(path):
+    if os.path.isdir(path):
+        return sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+    return os.path.getsize(path)
+
+
+def benchmark(name, load, path, X_test, y_test, single_rows=200):
+    """Accuracy and speed of one saved model, loaded fresh from disk"""
+    started = time.perf_counter()
+    model = load(path)
+    load_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    predicted = model.predict(X_test)
+    batch_seconds = time.perf_counter() - started
+
+    latencies = []
+    for i in range(min(single_rows, len(X_test))):
+        row = X_test.iloc[[i]]
+        started = time.perf_counter()
+        model.predict(row)
+        latencies.append(time.perf_counter() - started)
+
+    return {
+        'model': name,
+        'accuracy': float(np.mean(np.asarray(predicted) == np.asarray(y_test))),
+        'p50_ms': float(np.percentile(latencies, 50) * 1000),
+        'p99_ms': float(np.percentile(latencies, 99) * 1000),
+        'rows_per_second': len(X_test) / batch_seconds if batch_seconds else 0.0,
+        'size_bytes': _size_bytes(path),
+        'load_seconds': load_seconds
+    }
+
+
+def print_report(results):
+    print(f"\n{'model':<26} {'accuracy':>8} {'p50 ms':>7} {'p99 ms':>7} "
+          f"{'rows/s':>9} {'size MiB':>9} {'load ms':>8}")
+    for r in results:
+        print(f"{r['model']:<26} {r['accuracy']:>8.4f} {r['p50_ms']:>7.2f} {r['p99_ms']:>7.2f} "
+              f"{r['rows_per_second']:>9.0f} {r['size_bytes'] / 1024 / 1024:>9.2f} "
+              f"{r['load_seconds'] * 1000:>8.1f}")
+
+
+def train_streaming(args):
+    trainer = StreamingTrainer(
+        args.data, chunksize=args.chunksize, epochs=args.epochs,
+        holdout_permille=args.holdout_permille, checkpoint_path=args.checkpoint,
+        checkpoint_every=args.checkpoint_every, n_jobs=args.n_jobs
+    )
+    model, le, holdout, accuracy = trainer.run(resume=args.resume)
+    if accuracy is not None:
+        print(f"sgd_stream holdout accuracy: {accuracy:.4f}")
+
+    # Only the finished model is sparsified; checkpoints stay dense for partial_fit.
+    # Hashed columns no chunk ever hit keep zero weights, so this shrinks the
+    # pickle and the per-row predict cost
+    model.named_steps['clf'].sparsify()
+    paths = save_backend('sgd_stream', model, le)
+    print(f"Wrote {', '.join(paths)}")
 
-df = pd.read_csv("master_dataset.csv")
+    if args.report and not holdout.empty:
+        result = benchmark('sgd_stream', joblib.load, paths[0],
+                           holdout[FEATURES], le.transform(holdout['Category']))
+        print_report([result])
+        with open(args.report_path, 'w') as f:
+            json.dump([result], f, indent=2)
+        print(f"\nReport written to {args.report_path}")
 
-# Clean 'Amount' column
-df['Amount'] = (
-    df['Amount']
-    .astype(str)
-    .str.replace(r'[^\d\.-]', '', regex=True)  # Remove all non-numeric characters (except dot and minus)
-    .astype(float)
-)
 
-# Drop rows with missing labels
-df = df.dropna(subset=['Category'])
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('--data', default='master_dataset.csv')
+    ap.add_argument('--backend', nargs='+', default=[DEFAULT_BACKEND], choices=BACKENDS + ('all',))
+    ap.add_argument('--text-features', choices=TEXT_FEATURES,
+                    help='description features (default depends on the backend)')
+    ap.add_argument('--n-jobs', type=int, default=None, help='cores for estimators that support it')
+    ap.add_argument('--report', action='store_true', help='benchmark every trained backend')
+    ap.add_argument('--report-path', default='model_report.json')
+    ap.add_argument('--stream', action='store_true', help='train sgd_stream out of core')
+    ap.add_argument('--chunksize', type=int, default=100_000, help='rows per streamed chunk')
+    ap.add_argument('--epochs', type=int, default=1, help='passes over the file when streaming')
+    ap.add_argument('--holdout-permille', type=int, default=20, help='rows per 1000 held out for evaluation')
+    ap.add_argument('--checkpoint', default='sgd_stream.checkpoint')
+    ap.add_argument('--checkpoint-every', type=int, default=10, help='chunks between checkpoints')
+    ap.add_argument('--resume', action='store_true', help='continue from --checkpoint if it exists')
+    args = ap.parse_args()
 
-# Clean text
-df['Description'] = df['Description'].str.lower().str.strip()
+    if args.stream:
+        train_streaming(args)
+        return
 
-# Encode target labels
-le = LabelEncoder()
-df['CategoryEncoded'] = le.fit_transform(df['Category'])
+    backends = BACKENDS if 'all' in args.backend else tuple(dict.fromkeys(args.backend))
+    df = load_dataset(args.data)
 
-# Define features and target
-X = df[['Description', 'Amount', 'Type']]
-y = df['CategoryEncoded']
+    # Encode target labels
+    le = LabelEncoder()
+    df['CategoryEncoded'] = le.fit_transform(df['Category'])
 
-# Split
-X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    # Define features and target
+    X = df[['Description', 'Amount', 'Type']]
+    y = df['CategoryEncoded']
 
-# Column transformer to handle different input types
-preprocessor = ColumnTransformer(transformers=[
-    ('desc', TfidfVectorizer(), 'Description'),
-    ('type', OneHotEncoder(handle_unknown='ignore'), ['Type']),
-    ('amount', 'passthrough', ['Amount'])
-])
+    # Split
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
 
-# Pipeline
-model = Pipeline(steps=[
-    ('pre', preprocessor),
-    ('clf', RandomForestClassifier(n_estimators=100, random_state=42))
-])
+    results = []
+    for backend in backends:
+        model = train_backend(backend, X_train, y_train, args.text_features, args.n_jobs)
+        print(f"{backend} accuracy: {model.score(X_test, y_test):.4f}")
+        paths = save_backend(backend, model, le)
+        print(f"Wrote {', '.join(paths)}")
 
-# Train
-model.fit(X_train, y_train)
+        if args.report:
+            results.append(benchmark(backend, joblib.load, paths[0], X_test, y_test))
+            if artifact_path(backend):
+                results.append(benchmark(f'{backend} (memmap)', load_artifact, paths[-1], X_test, y_test))
 
-# Evaluate
-print("Model accuracy:", model.score(X_test, y_test))
+    if args.report:
+        print_report(results)
+        with open(args.report_path, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nReport written to {args.report_path}")
 
-joblib.dump(model, 'transaction_classifier.pkl')
 
+if __name__ == '__main__':
+    main()
@@ -41,11 +41,37 @@ class Transaction(db.Model):
     description = db.Column(db.String(200), nullable=False)
     amount = db.Column(db.Float, nullable=False)
     type = db.Column(db.String(10), nullable=False)  # 'debit' or 'credit'
+    # sha256 of user, date, amount, type and normalized description; set for
+    # imported rows so re-uploading an overlapping statement is a no-op
+    fingerprint = db.Column(db.String(64))
     created_at = db.Column(db.DateTime, server_default=db.func.now())
+
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'fingerprint', name='uq_transactions_user_fingerprint'),
+        # Serve the per-user date-range filters used by the dashboard and reports
+        db.Index('ix_transactions_user_type_date', 'user_id', 'type', 'date'),
+        db.Index('ix_transactions_user_category_date', 'user_id', 'category_id', 'date'),
+        db.Index('ix_transactions_user_date', 'user_id', 'date'),
+    )
     
     category = db.relationship('Category', backref='transactions')
     user = db.relationship('User', backref='transactions')
 
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'date': self.date.isoformat(),
+            'description': self.description,
+            'amount': self.amount,
+            'type': self.type,
+            'category': {
+                'id': self.category.id,
+                'name': self.category.name,
+                'color': self.category.color,
+                'icon': self.category.icon
+            } if self.category else None
+        }
+
 class Budget(db.Model):
     __tablename__ = 'budgets'
     id = db.Column(db.Integer, primary_key=True)
@@ -56,4 +82,66 @@ class Budget(db.Model):
     created_at = db.Column(db.DateTime, server_default=db.func.now())
     
     category = db.relationship('Category', backref='budgets')
-    user = db.relationship('User', backref='budgets')
\ No newline at end of file
+    user = db.relationship('User', backref='budgets')
+
+class ImportJob(db.Model):
+    __tablename__ = 'import_jobs'
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), index=True)
+    filename = db.Column(db.String(255), nullable=False)
+    file_path = db.Column(db.String(500), nullable=False)
+    file_type = db.Column(db.String(10), nullable=False)  # 'pdf' or 'csv'
+    status = db.Column(db.String(20), default='queued')  # queued, running, completed, failed
+    stage = db.Column(db.String(20))  # parsing, classifying, saving
+    total_rows = db.Column(db.Integer, default=0)
+    processed_rows = db.Column(db.Integer, default=0)
+    imported_count = db.Column(db.Integer, default=0)
+    skipped_count = db.Column(db.Integer, default=0)
+    duplicate_count = db.Column(db.Integer, default=0)
+    error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, server_default=db.func.now())
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+    # Touched by the running worker; a running job that stops beating was orphaned
+    heartbeat_at = db.Column(db.DateTime)
+
+    user = db.relationship('User', backref='import_jobs')
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'filename': self.filename,
+            'status': self.status,
+            'stage': self.stage,
+            'total_rows': self.total_rows or 0,
+            'processed_rows': self.processed_rows or 0,
+            'imported_count': self.imported_count or 0,
+            'skipped_count': self.skipped_count or 0,
+            'duplicate_count': self.duplicate_count or 0,
+            'error': self.error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+
+# Per user/category/month/type rollup of transaction amounts. Maintained
+# incrementally by analytics.rollups on every transaction write, backfilled
+# on first start against an existing database; rebuild with
+# `flask rebuild-rollups`.
+class MonthlyCategoryTotal(db.Model):
+    __tablename__ = 'monthly_category_totals'
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    category_id = db.Column(db.Integer, db.ForeignKey('categories.id'))
+    year = db.Column(db.Integer, nullable=False)
+    month = db.Column(db.Integer, nullable=False)
+    type = db.Column(db.String(10), nullable=False)  # 'debit' or 'credit'
+    total = db.Column(db.Float, nullable=False, default=0)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'category_id', 'year', 'month', 'type', name='uq_monthly_totals_key'),
+        db.Index('ix_monthly_totals_user_period', 'user_id', 'year', 'month'),
+    )
+
+    category = db.relationship('Category')
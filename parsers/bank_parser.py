@@ -3,9 +3,120 @@ import pandas as pd
 import fitz
 import re
 import os
+import multiprocessing
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from typing import Optional 
 
+# Region of each statement page that holds the transaction table
+TABLE_AREAS = ['30,630,600,60']
+
+
+def _combine_rows(t):
+    """Merge wrapped description lines into the row that starts them"""
+    group_id = t[0].ne('').cumsum()
+    return t.astype(str).groupby(group_id).agg(lambda x: ' '.join(x[x != '']).strip())
+
+
+def _read_pdf_pages(pdf_path, pages):
+    """Parse one page range; module-level so it can run in a worker process"""
+    tables = camelot.read_pdf(
+        pdf_path,
+        flavor='stream',
+        table_areas=TABLE_AREAS,
+        pages=pages
+    )
+    return [_combine_rows(table.df) for table in tables]
+
+
+def _default_pdf_workers():
+    """PDF_PARSE_WORKERS, else this import process's share of the CPUs.
+
+    Every import pool process (IMPORT_WORKERS of them) can parse a PDF at
+    once, so each gets cpu_count // IMPORT_WORKERS page workers, at most 4.
+    """
+    configured = int(os.environ.get('PDF_PARSE_WORKERS', 0))
+    if configured:
+        return configured
+    import_workers = max(1, int(os.environ.get('IMPORT_WORKERS', 2)))
+    return max(1, min(4, (os.cpu_count() or 1) // import_workers))
+
+
+# Seconds an unused page-parsing pool is kept before its workers exit
+PDF_POOL_IDLE_SECONDS = float(os.environ.get('PDF_POOL_IDLE_SECONDS', 60))
+
+# One page-parsing pool per process, reused by back-to-back PDF parses so
+# the interpreter start and camelot import are paid once, not per
+# statement. Each spawned worker holds its own camelot stack, so the pool
+# is shut down once it has sat idle for PDF_POOL_IDLE_SECONDS.
+_pdf_pool = None
+_pdf_pool_workers = 0
+_pdf_pool_users = 0
+_pdf_pool_timer = None
+_pdf_pool_lock = threading.Lock()
+
+
+@contextmanager
+def _borrow_pdf_pool(workers):
+    global _pdf_pool, _pdf_pool_workers, _pdf_pool_users
+    retired = None
+    with _pdf_pool_lock:
+        if _pdf_pool_timer is not None:
+            _pdf_pool_timer.cancel()
+        if _pdf_pool is not None and _pdf_pool_workers != workers and not _pdf_pool_users:
+            retired, _pdf_pool = _pdf_pool, None
+        if _pdf_pool is None:
+            # spawn keeps the workers from inheriting open DB connections
+            _pdf_pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+            _pdf_pool_workers = workers
+        _pdf_pool_users += 1
+        pool = _pdf_pool
+    if retired is not None:
+        retired.shutdown(wait=True)
+
+    try:
+        yield pool
+    finally:
+        _return_pdf_pool()
+
+
+def _return_pdf_pool():
+    global _pdf_pool_users, _pdf_pool_timer
+    with _pdf_pool_lock:
+        _pdf_pool_users -= 1
+        if _pdf_pool is not None and not _pdf_pool_users:
+            _pdf_pool_timer = threading.Timer(PDF_POOL_IDLE_SECONDS, _shutdown_idle_pdf_pool, args=(_pdf_pool,))
+            _pdf_pool_timer.daemon = True
+            _pdf_pool_timer.start()
+
+
+def _shutdown_idle_pdf_pool(pool):
+    global _pdf_pool
+    with _pdf_pool_lock:
+        # Borrowed again (or replaced) since the timer was set
+        if _pdf_pool is not pool or _pdf_pool_users:
+            return
+        _pdf_pool = None
+    pool.shutdown(wait=True)
+
+
+def _discard_pdf_pool():
+    global _pdf_pool
+    with _pdf_pool_lock:
+        _pdf_pool = None
+
+
 class BankStatementParser:
+    def __init__(self, pdf_workers=None, pages_per_chunk=4):
+        self.pdf_workers = pdf_workers or _default_pdf_workers()
+        self.pages_per_chunk = max(1, pages_per_chunk)
+        self._parsed_pdf = None
+
     def parse_file(self, file_path, file_type):
         """Use your original parsing logic with minor adaptations"""
         if file_type == 'pdf':
@@ -13,27 +124,83 @@ class BankStatementParser:
         else:
             return self._parse_csv(file_path)
 
-    def _parse_pdf(self, pdf_path):
-        """Your original PDF parsing logic"""
-        page_count = fitz.open(pdf_path).page_count
-        str_pages = f'2-{page_count - 2}'
-
-        tables = camelot.read_pdf(
-            pdf_path,
-            flavor='stream',
-            table_areas=['30,630,600,60'],
-            pages=str_pages
+    def count_rows(self, file_path, file_type, chunksize=100_000):
+        """Number of data rows, without loading a CSV into memory.
+
+        Counted with the same CSV reader iter_chunks uses, so quoted fields
+        spanning several lines count as one row.
+        """
+        if file_type == 'pdf':
+            return len(self._parse_pdf_cached(file_path))
+        return sum(len(chunk) for chunk in pd.read_csv(file_path, chunksize=chunksize, usecols=[0]))
+
+    def iter_chunks(self, file_path, file_type, chunksize, start_row=0, stop_row=None):
+        """Yield the raw statement in frames of at most chunksize rows.
+
+        CSVs are streamed with read_csv(chunksize=...); start_row data rows
+        are skipped first so an interrupted import can resume. stop_row, if
+        given, ends the stream before that data row.
+        """
+        if file_type == 'pdf':
+            df = self._parse_pdf_cached(file_path)
+            end = len(df) if stop_row is None else min(stop_row, len(df))
+            for offset in range(start_row, end, chunksize):
+                yield df.iloc[offset:min(offset + chunksize, end)]
+            return
+
+        if stop_row is not None and stop_row <= start_row:
+            return
+        reader = pd.read_csv(
+            file_path,
+            chunksize=chunksize,
+            skiprows=range(1, start_row + 1) if start_row else None,
+            nrows=None if stop_row is None else stop_row - start_row
         )
+        for chunk in reader:
+            yield chunk
+
+    def _parse_pdf_cached(self, pdf_path):
+        # PDFs have to be parsed whole; keep the result for count_rows + iter_chunks
+        if self._parsed_pdf is None or self._parsed_pdf[0] != pdf_path:
+            self._parsed_pdf = (pdf_path, self._parse_pdf(pdf_path))
+        return self._parsed_pdf[1]
+
+    def _page_chunks(self, first_page, last_page):
+        return [
+            f'{start}-{min(start + self.pages_per_chunk - 1, last_page)}'
+            for start in range(first_page, last_page + 1, self.pages_per_chunk)
+        ]
+
+    def _parse_pdf(self, pdf_path):
+        """Your original PDF parsing logic, split into page ranges parsed in parallel"""
+        with fitz.open(pdf_path) as doc:
+            page_count = doc.page_count
 
-        processed_tables = []
-        for table in tables:
-            t = table.df
-            group_id = t[0].ne('').cumsum()
-            df_combined = t.astype(str).groupby(group_id).agg(lambda x: ' '.join(x[x != '']).strip())
-            processed_tables.append(df_combined)
-        
+        chunks = self._page_chunks(2, page_count - 2)
+        if not chunks:
+            # Too short for the usual layout; let camelot report on the range as before
+            chunks = [f'2-{page_count - 2}']
+
+        if min(self.pdf_workers, len(chunks)) <= 1:
+            results = [_read_pdf_pages(pdf_path, pages) for pages in chunks]
+        else:
+            # Sized by the configured worker count rather than this file's
+            # page count, so statements of any length share one pool
+            try:
+                results = self._map_pages(pdf_path, chunks)
+            except BrokenProcessPool:
+                # A crashed worker poisons the whole pool; retry on a fresh one
+                _discard_pdf_pool()
+                results = self._map_pages(pdf_path, chunks)
+
+        processed_tables = [table for chunk_tables in results for table in chunk_tables]
         return pd.concat(processed_tables, join='outer')
 
+    def _map_pages(self, pdf_path, chunks):
+        with _borrow_pdf_pool(self.pdf_workers) as pool:
+            # map() yields in submission order, so pages stay in order
+            return list(pool.map(_read_pdf_pages, [pdf_path] * len(chunks), chunks))
+
     def _parse_csv(self, csv_path):
         """Simple CSV reader maintaining your format"""
         return pd.read_csv(csv_path)
@@ -0,0 +1,154 @@
+import re
+from datetime import datetime
+from functools import lru_cache
+import pandas as pd
+
+# Common Jamaican bank formats, in the order the old parser tried them
+DATE_FORMATS = [
+    '%d%b',          # 07APR (no year - current year is assumed)
+    '%d-%b-%y',      # 15-Jan-23
+    '%d-%b-%Y',      # 15-Jan-2023
+    '%d %b %Y',      # 15 Jan 2023
+    '%d %b %y',      # 15 Jan 23
+    '%d/%m/%Y',      # 15/01/2023
+    '%d/%m/%y',      # 15/01/23
+    '%Y-%m-%d',      # 2023-01-15
+    '%m/%d/%Y',      # 01/15/2023
+    '%m/%d/%y',      # 01/15/23
+    '%b %d, %Y',     # Jan 15, 2023
+    '%d-%m-%Y',      # 15-01-2023
+    '%d-%m-%y',      # 15-01-23
+]
+
+YEARLESS_FORMAT = '%d%b'
+EMPTY_DATES = ['nan', 'none', 'nat', '']
+
+MONTH_MAP = {
+    'jan': '01', 'feb': '02', 'mar': '03', 'apr': '04',
+    'may': '05', 'jun': '06', 'jul': '07', 'aug': '08',
+    'sep': '09', 'oct': '10', 'nov': '11', 'dec': '12'
+}
+
+
+def _clean(date_str):
+    return re.sub(r'\s+', ' ', str(date_str).strip())
+
+
+def detect_date_format(values, sample_size=50):
+    """Pick the format that parses the most values from a sample of the column"""
+    sample = [
+        _clean(v) for v in values
+        if str(v).strip().lower() not in EMPTY_DATES
+    ][:sample_size]
+    if not sample:
+        return None
+
+    best_format, best_hits = None, 0
+    for fmt in DATE_FORMATS:
+        hits = 0
+        for value in sample:
+            try:
+                datetime.strptime(value, fmt)
+                hits += 1
+            except ValueError:
+                pass
+        # Earlier formats win ties, matching the old per-row order
+        if hits > best_hits:
+            best_format, best_hits = fmt, hits
+            if hits == len(sample):
+                break
+    return best_format
+
+
+def _clean_column(column):
+    text = column.astype(str).str.strip().str.replace(r'\s+', ' ', regex=True)
+    return text, text.str.lower().isin(EMPTY_DATES)
+
+
+def detect_column_format(column, sample_size=50):
+    """Date format of a column of date strings, from a sample of its distinct values"""
+    text, empty = _clean_column(column)
+    return detect_date_format(text[~empty].unique()[:sample_size * 4], sample_size)
+
+
+def parse_date_column(column, sample_size=50, fmt=None):
+    """Parse a column of date strings in one vectorized pass.
+
+    The format is detected once from a sample unless fmt is given (pass the
+    format detected on a statement's first chunk to parse later chunks the
+    same way). Rows that do not match it (files that mix formats) fall back
+    to the memoized per-value parser.
+    """
+    text, empty = _clean_column(column)
+
+    if fmt is None:
+        fmt = detect_date_format(text[~empty].unique()[:sample_size * 4], sample_size)
+    if fmt is None:
+        parsed = pd.Series(pd.NaT, index=column.index, dtype='datetime64[ns]')
+    else:
+        parsed = pd.to_datetime(text.where(~empty), format=fmt, errors='coerce')
+        if fmt == YEARLESS_FORMAT:
+            parsed = pd.to_datetime(pd.DataFrame({
+                'year': datetime.now().year,
+                'month': parsed.dt.month,
+                'day': parsed.dt.day
+            }), errors='coerce')
+
+    # Slow path only for the rows the detected format could not handle
+    failed = parsed.isna() & ~empty
+    if failed.any():
+        year = datetime.now().year
+        fallback = text[failed].map(lambda value: parse_date(value, year))
+        parsed[failed] = pd.to_datetime(fallback, errors='coerce').to_numpy()
+    return parsed
+
+
+def parse_date(date_str, current_year=None):
+    """Improved date parsing for Jamaican bank formats"""
+    # Resolve the year before the cache, so yearless dates never keep the
+    # year of the first call
+    return _parse_date(date_str, current_year or datetime.now().year)
+
+
+@lru_cache(maxsize=4096)
+def _parse_date(date_str, current_year):
+    if not date_str or str(date_str).lower() in EMPTY_DATES:
+        return None
+
+    date_str = _clean(date_str)
+
+    for fmt in DATE_FORMATS:
+        try:
+            parsed_date = datetime.strptime(date_str, fmt).date()
+            if fmt == YEARLESS_FORMAT:
+                parsed_date = parsed_date.replace(year=current_year)
+            return parsed_date
+        except ValueError:
+            continue
+
+    # Try with regex for mixed formats
+    # Pattern: DD-MMM-YY or DD MMM YYYY etc
+    pattern = r'(\d{1,2})[-\s/]([a-zA-Z]{3}|\d{1,2})[-\s/](\d{2,4})'
+    match = re.search(pattern, date_str.lower())
+
+    if match:
+        day, month, year = match.groups()
+
+        # Convert month name to number if needed
+        if month.isalpha() and month.lower() in MONTH_MAP:
+            month = MONTH_MAP[month.lower()]
+
+        # Convert 2-digit year to 4-digit
+        if len(year) == 2:
+            year_int = int(year)
+            if year_int > 50:  # Assume 1950-1999
+                year = f"19{year}"
+            else:  # Assume 2000-2049
+                year = f"20{year}"
+
+        try:
+            return datetime(int(year), int(month), int(day)).date()
+        except ValueError:
+            pass
+
+    return None
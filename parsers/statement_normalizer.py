@@ -0,0 +1,81 @@
+import pandas as pd
+from parsers.date_inference import detect_column_format, parse_date_column
+
+# Values the old per-row parser treated as "no amount"
+EMPTY_AMOUNTS = ['', 'nan', 'None', '0.0', '0']
+EMPTY_DESCRIPTIONS = ['nan', 'none', '']
+
+
+class StatementNormalizer:
+    """Column-wise cleanup of a parsed statement.
+
+    Takes the raw frame from BankStatementParser (date, description, credit,
+    debit by position) and returns a typed frame with columns date,
+    description, amount and type, plus a report of the rows that were
+    dropped and why. Every step runs on whole columns.
+    """
+
+    @staticmethod
+    def detect_date_format(raw_df):
+        """Format of the date column (the first), or None if nothing parses"""
+        if raw_df.shape[1] < 1 or raw_df.empty:
+            return None
+        return detect_column_format(raw_df.iloc[:, 0])
+
+    def normalize(self, raw_df, date_format=None):
+        """date_format, if given, is used instead of detecting one for this frame"""
+        if raw_df.shape[1] < 4:
+            skipped = pd.DataFrame({'reason': 'Too few columns'}, index=raw_df.index)
+            return self._empty_frame(), skipped
+
+        date_raw = raw_df.iloc[:, 0].astype(str).str.strip()
+        description = raw_df.iloc[:, 1].astype(str).str.strip()
+        credit = self.parse_amounts(raw_df.iloc[:, 2])
+        debit = self.parse_amounts(raw_df.iloc[:, 3])
+
+        # Debit wins when both columns carry a non-zero amount
+        is_debit = debit.notna() & (debit != 0)
+        is_credit = ~is_debit & credit.notna() & (credit != 0)
+        amount = debit.where(is_debit, credit).abs()
+        txn_type = pd.Series('debit', index=raw_df.index).where(is_debit, 'credit')
+
+        reason = pd.Series(None, index=raw_df.index, dtype=object)
+        reason[credit.isna() & debit.isna()] = 'No valid amount'
+        reason[reason.isna() & ~is_debit & ~is_credit] = 'Zero amount'
+        reason[reason.isna() & description.str.lower().isin(EMPTY_DESCRIPTIONS)] = 'Empty description'
+
+        dates = parse_date_column(date_raw, fmt=date_format)
+        reason[reason.isna() & dates.isna()] = 'Could not parse date'
+
+        keep = reason.isna()
+        frame = pd.DataFrame({
+            'date': dates[keep].to_numpy(),
+            'description': description[keep].to_numpy(),
+            'amount': amount[keep].to_numpy(dtype=float),
+            'type': txn_type[keep].to_numpy()
+        }, index=raw_df.index[keep.to_numpy()])
+        skipped = reason[~keep].to_frame('reason')
+        return frame, skipped
+
+    @staticmethod
+    def parse_amounts(column):
+        """Vectorized J$/comma/parenthesis amount parsing; NaN where there is no amount"""
+        text = column.astype(str).str.strip()
+        missing = text.isin(EMPTY_AMOUNTS)
+
+        text = text.str.replace('J$', '', regex=False).str.replace(',', '', regex=False)
+        is_negative = text.str.contains(r'[-(]', regex=True)
+        digits = text.str.replace(r'[^\d\.]', '', regex=True)
+
+        values = pd.to_numeric(digits.where(digits != ''), errors='coerce')
+        values = values.where(~is_negative, -values)
+        return values.mask(missing)
+
+    @staticmethod
+    def _empty_frame():
+        return pd.DataFrame({
+            'date': pd.Series(dtype='datetime64[ns]'),
+            'description': pd.Series(dtype=str),
+            'amount': pd.Series(dtype=float),
+            'type': pd.Series(dtype=str)
+        })
@@ -0,0 +1,33 @@
+import os
+import sys
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+@pytest.fixture
+def app(tmp_path):
+    from app import create_app, init_database
+
+    app = create_app(
+        SQLALCHEMY_DATABASE_URI=f"sqlite:///{tmp_path / 'spendsense.db'}",
+        UPLOAD_FOLDER=str(tmp_path / 'uploads'),
+        TESTING=True
+    )
+    with app.app_context():
+        init_database()
+        yield app
+
+
+@pytest.fixture
+def user(app):
+    from app import ensure_default_categories
+    from models import db, User
+
+    ensure_default_categories()
+    user = User(username='alice', email='alice@example.com', has_completed_setup=True)
+    user.set_password('secret')
+    db.session.add(user)
+    db.session.commit()
+    return user
@@ -0,0 +1,90 @@
+import gc
+import io
+import os
+import time
+import pytest
+import import_jobs
+from app import create_app
+from ml.model_registry import registry as model_registry
+from ml.predictor import resolve_encoder_path, resolve_model_path
+from models import db, ImportJob, Transaction
+from tests.conftest import ROOT
+
+
+@pytest.fixture
+def import_pool():
+    yield
+    if import_jobs._executor is not None:
+        import_jobs._executor.shutdown(wait=True)
+    import_jobs._executor = None
+    import_jobs._app = None
+
+
+def test_create_app_needs_no_app_context(tmp_path):
+    upload_folder = tmp_path / 'uploads'
+    app = create_app(
+        SQLALCHEMY_DATABASE_URI=f"sqlite:///{tmp_path / 'app.db'}",
+        UPLOAD_FOLDER=str(upload_folder)
+    )
+
+    assert upload_folder.is_dir()
+    assert {'dashboard', 'transactions', 'upload', 'api_transactions'} <= set(app.view_functions)
+    assert 'result_cache' in app.extensions
+    assert app.test_client().get('/login').status_code == 200
+
+
+def test_warmup_loads_the_configured_classifier(tmp_path, monkeypatch):
+    monkeypatch.chdir(ROOT)
+    model_registry.invalidate()
+    app = create_app(
+        warmup=True,
+        SQLALCHEMY_DATABASE_URI=f"sqlite:///{tmp_path / 'app.db'}",
+        UPLOAD_FOLDER=str(tmp_path / 'uploads'),
+        MODEL_BACKEND='forest',
+        MODEL_PATH=None
+    )
+    gc.unfreeze()
+
+    assert app.extensions.get('database_ready')
+    loaded = model_registry.stats()['artifacts']
+    assert os.path.basename(resolve_model_path(None, 'forest')) in loaded
+    assert os.path.basename(resolve_encoder_path(None, 'forest')) in loaded
+
+
+def test_upload_is_imported_by_the_pool(app, user, import_pool):
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = str(user.id)
+
+    statement = b"Date,Description,Credit,Debit\n15/01/2023,COFFEE SHOP,,500.00\n17/01/2023,SALARY,150000.00,\n"
+    response = client.post(
+        '/upload', data={'file': (io.BytesIO(statement), 'statement.csv')},
+        headers={'Accept': 'application/json'}, content_type='multipart/form-data'
+    )
+    assert response.status_code == 202
+    job_id = response.get_json()['id']
+
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        db.session.expire_all()
+        job = db.session.get(ImportJob, job_id)
+        if job.status in ('completed', 'failed'):
+            break
+        time.sleep(0.2)
+
+    assert (job.status, job.error) == ('completed', None)
+    assert job.imported_count == 2
+    assert Transaction.query.filter_by(user_id=user.id).count() == 2
+    assert not os.path.exists(job.file_path)
+
+
+def test_model_stats_hides_server_paths(app, user, monkeypatch):
+    monkeypatch.chdir(ROOT)
+    model_registry.get('label_encoder.pkl')
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = str(user.id)
+
+    artifacts = client.get('/model-stats').get_json()['artifacts']
+    assert 'label_encoder.pkl' in artifacts
+    assert not any(os.sep in name for name in artifacts)
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+from ml.artifacts import is_artifact, load_artifact, save_forest_artifact
+from ml.backends import build_pipeline
+
+WORDS = ['coffee', 'uber', 'amazon', 'grocery', 'salary', 'rent', 'netflix', 'fuel', 'pharmacy', 'transfer']
+
+
+def make_frame(rows, seed):
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame({
+        'Description': [' '.join(rng.choice(WORDS, 3)) for _ in range(rows)],
+        'Amount': rng.uniform(-500, 5000, rows).round(2),
+        'Type': rng.choice(['DEBIT', 'CREDIT'], rows)
+    })
+    # Labels depend on words, type and amount so every block is split on
+    y = (X['Description'].str.contains('coffee').astype(int)
+         + 2 * (X['Type'] == 'CREDIT').astype(int)
+         + (X['Amount'] > 2500).astype(int))
+    return X, y.to_numpy()
+
+
+@pytest.mark.parametrize('backend,text_features', [
+    ('forest', None),
+    ('shallow_forest', None),
+    ('forest', 'word+char'),
+])
+def test_artifact_predictions_match_pipeline(tmp_path, backend, text_features):
+    X_train, y_train = make_frame(400, seed=0)
+    X_test, _ = make_frame(300, seed=1)
+    X_test.loc[0, 'Description'] = 'never seen words'
+    X_test.loc[1, 'Type'] = 'UNKNOWN'
+
+    model = build_pipeline(backend, text_features=text_features)
+    model.set_params(clf__n_estimators=10)
+    model.fit(X_train, y_train)
+
+    directory = save_forest_artifact(model, str(tmp_path / 'model.artifact'), labels=['a', 'b', 'c', 'd', 'e'])
+    assert is_artifact(directory)
+
+    artifact = load_artifact(directory)
+    np.testing.assert_array_equal(artifact.predict(X_test), model.predict(X_test))
+    np.testing.assert_allclose(artifact.predict_proba(X_test), model.predict_proba(X_test), atol=1e-12)
+
+
+def test_save_replaces_existing_artifact(tmp_path):
+    X, y = make_frame(200, seed=2)
+    model = build_pipeline('shallow_forest')
+    model.set_params(clf__n_estimators=5)
+    model.fit(X, y)
+
+    target = str(tmp_path / 'model.artifact')
+    save_forest_artifact(model, target)
+    save_forest_artifact(model, target)
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['model.artifact']
+    np.testing.assert_array_equal(load_artifact(target).predict(X), model.predict(X))
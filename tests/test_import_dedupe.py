@@ -0,0 +1,51 @@
+import pytest
+from models import Transaction
+from transaction_processor import TransactionProcessor
+
+STATEMENT = """Date,Description,Credit,Debit
+15/01/2023,COFFEE SHOP,,500.00
+16/01/2023,UBER TRIP,,1200.00
+15/01/2023,COFFEE SHOP,,500.00
+17/01/2023,SALARY,150000.00,
+"""
+
+
+class Interrupted(Exception):
+    pass
+
+
+def write_statement(tmp_path):
+    path = tmp_path / 'statement.csv'
+    path.write_text(STATEMENT)
+    return str(path)
+
+
+def import_file(user, path, **kwargs):
+    return TransactionProcessor().process_uploaded_file(user.id, path, 'csv', **kwargs)
+
+
+def test_repeated_rows_are_kept_and_reimport_is_deduplicated(tmp_path, user):
+    path = write_statement(tmp_path)
+
+    assert import_file(user, path) == 4
+    assert import_file(user, path) == 0
+    assert Transaction.query.filter_by(user_id=user.id).count() == 4
+
+
+def test_resume_keeps_repeats_after_the_start_row(tmp_path, user):
+    path = write_statement(tmp_path)
+
+    def fail_after_first_chunk(processed_rows=0, **fields):
+        # Raised before the second chunk's commit, so only rows 0-1 are saved
+        if processed_rows > 2:
+            raise Interrupted()
+
+    with pytest.raises(Interrupted):
+        import_file(user, path, chunksize=2, progress_callback=fail_after_first_chunk)
+    assert Transaction.query.filter_by(user_id=user.id).count() == 2
+
+    # The second COFFEE SHOP row repeats row 0 but is a distinct transaction
+    assert import_file(user, path, chunksize=2, start_row=2) == 2
+    assert Transaction.query.filter_by(user_id=user.id, description='COFFEE SHOP').count() == 2
+
+    assert import_file(user, path) == 0
@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta
+import import_jobs
+from models import db, ImportJob
+
+
+def add_job(user, status, heartbeat_age=None):
+    now = datetime.now()
+    job = ImportJob(user_id=user.id, filename='statement.csv', file_path='/tmp/statement.csv',
+                    file_type='csv', status=status)
+    if heartbeat_age is not None:
+        job.started_at = job.heartbeat_at = now - timedelta(seconds=heartbeat_age)
+    db.session.add(job)
+    db.session.commit()
+    return job.id
+
+
+def test_recover_requeues_orphans_and_submits_queued_jobs(app, user, monkeypatch):
+    submitted = []
+    monkeypatch.setattr(import_jobs, '_submit', lambda app, job_id: submitted.append(job_id))
+    app.config['IMPORT_HEARTBEAT_SECONDS'] = 30
+
+    orphaned = add_job(user, 'running', heartbeat_age=600)
+    alive = add_job(user, 'running', heartbeat_age=5)
+    queued = add_job(user, 'queued')
+    add_job(user, 'completed', heartbeat_age=600)
+
+    assert import_jobs.recover_orphaned_jobs(app) == [orphaned, queued]
+    assert submitted == [orphaned, queued]
+    assert db.session.get(ImportJob, orphaned).status == 'queued'
+    assert db.session.get(ImportJob, alive).status == 'running'
+
+
+def test_only_one_claim_wins(app, user):
+    job_id = add_job(user, 'queued')
+
+    assert import_jobs._claim(job_id)
+    assert not import_jobs._claim(job_id)
+    job = db.session.get(ImportJob, job_id)
+    assert job.status == 'running' and job.heartbeat_at is not None
+
+
+def test_first_request_recovers_the_queue(app, user, monkeypatch):
+    recovered = []
+    monkeypatch.setattr('app.recover_orphaned_jobs', lambda app: recovered.append(app))
+
+    client = app.test_client()
+    client.get('/login')
+    client.get('/login')
+    assert recovered == [app]
+
+
+def test_recovery_expires_old_failed_uploads(app, user, tmp_path, monkeypatch):
+    monkeypatch.setattr(import_jobs, '_submit', lambda app, job_id: None)
+    app.config['IMPORT_UPLOAD_RETENTION_DAYS'] = 7
+    now = datetime.now()
+
+    paths = {}
+    for name, status, age in (('old', 'failed', 8), ('recent', 'failed', 2), ('queued', 'queued', None)):
+        path = tmp_path / f'{name}.csv'
+        path.write_text('Date,Description\n')
+        paths[name] = path
+        db.session.add(ImportJob(user_id=user.id, filename=path.name, file_path=str(path), file_type='csv',
+                                 status=status, finished_at=now - timedelta(days=age) if age else None))
+    db.session.commit()
+
+    import_jobs.recover_orphaned_jobs(app)
+
+    assert not paths['old'].exists()
+    assert paths['recent'].exists() and paths['queued'].exists()
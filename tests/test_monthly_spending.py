@@ -0,0 +1,33 @@
+from datetime import date
+from analytics import rollups
+from analytics.dates import trailing_months
+from app import get_monthly_spending
+from models import db, Category, Transaction
+
+
+def test_trailing_months_cross_the_year_boundary():
+    assert trailing_months(2024, 2, 5) == [(2023, 10), (2023, 11), (2023, 12), (2024, 1), (2024, 2)]
+    assert trailing_months(2024, 1, 1) == [(2024, 1)]
+
+
+def test_monthly_spending_is_zero_filled_across_a_year_boundary(user):
+    category = Category.query.filter_by(is_default=True).first()
+    for day, amount, txn_type in (
+        (date(2023, 9, 30), 999.0, 'debit'),    # before the window
+        (date(2023, 10, 1), 20.0, 'debit'),
+        (date(2023, 10, 31), 5.0, 'debit'),
+        (date(2023, 12, 31), 40.0, 'debit'),
+        (date(2024, 1, 1), 500.0, 'credit'),   # income is not spending
+        (date(2024, 2, 29), 7.5, 'debit'),
+        (date(2024, 3, 1), 999.0, 'debit'),    # after the window
+    ):
+        txn = Transaction(user_id=user.id, category_id=category.id, date=day,
+                          description='spend', amount=amount, type=txn_type)
+        db.session.add(txn)
+        rollups.record_added(txn)
+    db.session.commit()
+
+    spending = get_monthly_spending(user.id, months=5, year=2024, month=2)
+
+    assert spending['labels'] == ['Oct 2023', 'Nov 2023', 'Dec 2023', 'Jan 2024', 'Feb 2024']
+    assert spending['data'] == [25.0, 0.0, 40.0, 0.0, 7.5]
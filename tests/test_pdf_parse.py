@@ -0,0 +1,49 @@
+import os
+import sys
+import time
+from parsers import bank_parser
+from parsers.bank_parser import BankStatementParser
+from tests.conftest import ROOT
+
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+from make_statement_pdf import write_statement  # noqa: E402
+
+
+def test_parallel_parse_reuses_one_pool_and_matches_serial(tmp_path, monkeypatch):
+    monkeypatch.setattr(bank_parser, 'PDF_POOL_IDLE_SECONDS', 0.5)
+    path = str(tmp_path / 'statement.pdf')
+    transactions = write_statement(path, pages=6, rows_per_page=10)
+
+    serial = BankStatementParser(pdf_workers=1).parse_file(path, 'pdf')
+    parser = BankStatementParser(pdf_workers=2, pages_per_chunk=2)
+    try:
+        first = parser.parse_file(path, 'pdf')
+        pool = bank_parser._pdf_pool
+        second = BankStatementParser(pdf_workers=2, pages_per_chunk=2).parse_file(path, 'pdf')
+        assert pool is not None and bank_parser._pdf_pool is pool
+
+        # Left idle, the pool shuts its workers down
+        time.sleep(2)
+        assert bank_parser._pdf_pool is None
+    finally:
+        if bank_parser._pdf_pool is not None:
+            bank_parser._pdf_pool.shutdown(wait=True)
+        bank_parser._discard_pdf_pool()
+
+    assert len(serial) == transactions
+    assert first.values.tolist() == serial.values.tolist() == second.values.tolist()
+
+
+def test_pdf_workers_share_the_cpus_among_import_workers(monkeypatch):
+    monkeypatch.delenv('PDF_PARSE_WORKERS', raising=False)
+    monkeypatch.setattr(os, 'cpu_count', lambda: 8)
+
+    monkeypatch.setenv('IMPORT_WORKERS', '2')
+    assert bank_parser._default_pdf_workers() == 4
+    monkeypatch.setenv('IMPORT_WORKERS', '4')
+    assert bank_parser._default_pdf_workers() == 2
+    monkeypatch.setenv('IMPORT_WORKERS', '16')
+    assert bank_parser._default_pdf_workers() == 1
+
+    monkeypatch.setenv('PDF_PARSE_WORKERS', '3')
+    assert bank_parser._default_pdf_workers() == 3
@@ -0,0 +1,101 @@
+import random
+from datetime import date, timedelta
+import pytest
+from analytics import rollups
+from analytics.projections import ProjectionEngine
+from models import db, Category, Transaction
+
+
+def add(user, category, day, amount, txn_type='debit'):
+    txn = Transaction(user_id=user.id, category_id=category.id, date=day,
+                      description='spend', amount=amount, type=txn_type)
+    db.session.add(txn)
+    rollups.record_added(txn)
+
+
+@pytest.fixture
+def categories(user):
+    return Category.query.filter_by(is_default=True, is_income=False).order_by(Category.id).all()
+
+
+def test_flat_matches_the_previous_rollup_formula(user, categories):
+    rng = random.Random(7)
+    for _ in range(300):
+        day = date(2024, 1, 1) + timedelta(days=rng.randrange(0, 136))
+        add(user, rng.choice(categories), day, round(rng.uniform(1, 200), 2), rng.choice(['debit', 'debit', 'credit']))
+    db.session.commit()
+
+    engine = ProjectionEngine(user.id, 2024, 5, model='flat', today=date(2024, 5, 16))
+    result = engine.project(categories)
+
+    # calculate_projections before the engine: three months of rollup
+    # totals over the days in those months, plus this month's total
+    history_days = (date(2024, 5, 1) - date(2024, 2, 1)).days
+    history = rollups.category_totals(user.id, [(2024, 2), (2024, 3), (2024, 4)])
+    current = rollups.category_totals(user.id, [(2024, 5)])
+    assert result['days_remaining'] == 15
+    for category in categories:
+        daily_rate = history.get(category.id, 0.0) / history_days
+        expected = current.get(category.id, 0.0) + daily_rate * 15
+        projection = result['categories'][category.name]
+        assert projection['daily_rate'] == pytest.approx(daily_rate)
+        assert projection['current'] == pytest.approx(current.get(category.id, 0.0))
+        assert projection['projected'] == pytest.approx(expected)
+
+
+@pytest.fixture
+def rent(user, categories):
+    # February 2024 (29 days) is the history for March 2024 (31 days)
+    category = categories[0]
+    add(user, category, date(2024, 2, 1), 100.0)
+    add(user, category, date(2024, 2, 10), 29.0)
+    add(user, category, date(2024, 3, 2), 10.0)
+    db.session.commit()
+    return category
+
+
+def project(user, category, model, today):
+    engine = ProjectionEngine(user.id, 2024, 3, model=model, history_months=1, today=today)
+    result = engine.project([category])
+    return result['days_remaining'], result['categories'][category.name]
+
+
+def test_day_of_month_uses_each_days_history(user, rent):
+    days_remaining, projection = project(user, rent, 'day_of_month', date(2024, 3, 5))
+
+    # March 6-31: the 10th repeats February's 29.0; the 30th and 31st,
+    # which February lacks, get the flat rate 129/29; other days spent nothing
+    remaining = 29.0 + 2 * 129.0 / 29
+    assert days_remaining == 26
+    assert projection['current'] == 10.0
+    assert projection['daily_rate'] == pytest.approx(remaining / 26)
+    assert projection['projected'] == pytest.approx(10.0 + remaining)
+
+
+def test_ewma_weights_recent_days(user, rent):
+    days_remaining, projection = project(user, rent, 'ewma', date(2024, 3, 5))
+
+    # 34 observed days (February and March 1-5); March 5 has age 0
+    weights = 0.5 ** (1 / 14)
+    total_weight = (1 - weights ** 34) / (1 - weights)
+    rate = (100.0 * weights ** 33 + 29.0 * weights ** 24 + 10.0 * weights ** 3) / total_weight
+    assert days_remaining == 26
+    assert projection['daily_rate'] == pytest.approx(rate)
+    assert projection['projected'] == pytest.approx(10.0 + 26 * rate)
+
+
+@pytest.mark.parametrize('model', ['flat', 'day_of_month', 'ewma'])
+def test_days_remaining_for_past_current_and_future_months(user, rent, model):
+    # Past month: nothing left to project
+    days_remaining, projection = project(user, rent, model, date(2024, 4, 10))
+    assert days_remaining == 0
+    assert projection['projected'] == pytest.approx(10.0)
+
+    # Last day of the month is already observed
+    assert project(user, rent, model, date(2024, 3, 31))[0] == 0
+    assert project(user, rent, model, date(2024, 3, 1))[0] == 30
+
+    # Future month: every day is still to come
+    days_remaining, projection = project(user, rent, model, date(2024, 2, 20))
+    assert days_remaining == 31
+    assert projection['projected'] == pytest.approx(10.0 + 31 * projection['daily_rate'])
@@ -0,0 +1,45 @@
+import os
+import runpy
+from analytics.cache import MemoryBackend, ResultCache, SQLiteBackend, create_cache
+from tests.conftest import ROOT
+
+
+def test_sqlite_invalidation_reaches_every_worker(tmp_path):
+    path = str(tmp_path / 'cache.sqlite3')
+    worker_a = ResultCache(SQLiteBackend(path, ttl=300))
+    worker_b = ResultCache(SQLiteBackend(path, ttl=300))
+
+    assert worker_a.get_or_compute('dashboard', 1, 2024, 5, lambda: {'income': 10}) == {'income': 10}
+    assert worker_b.get_or_compute('dashboard', 1, 2024, 5, lambda: {'income': 99}) == {'income': 10}
+
+    worker_a.invalidate_user(1, 2024, 5)
+    assert worker_b.get_or_compute('dashboard', 1, 2024, 5, lambda: {'income': 20}) == {'income': 20}
+
+
+def test_invalidate_user_keeps_other_users_and_months(tmp_path):
+    cache = ResultCache(MemoryBackend())
+    for key in (('monthly_report', 1, 2024, 12), ('monthly_report', 1, 2025, 1), ('monthly_report', 1, 2025, 2),
+                ('monthly_report', 1, 2024, 11), ('dashboard', 2, 2024, 12)):
+        cache.get_or_compute(*key, lambda: 'cached')
+
+    cache.invalidate_user(1, 2024, 12)
+
+    assert cache.get_or_compute('monthly_report', 1, 2024, 12, lambda: 'fresh') == 'fresh'
+    # January's spending change is measured against December
+    assert cache.get_or_compute('monthly_report', 1, 2025, 1, lambda: 'fresh') == 'fresh'
+    assert cache.get_or_compute('monthly_report', 1, 2025, 2, lambda: 'fresh') == 'cached'
+    assert cache.get_or_compute('monthly_report', 1, 2024, 11, lambda: 'fresh') == 'cached'
+    assert cache.get_or_compute('dashboard', 2, 2024, 12, lambda: 'fresh') == 'cached'
+
+
+def test_gunicorn_shares_the_cache_between_workers(monkeypatch, tmp_path):
+    monkeypatch.setattr(os, 'environ', {'GUNICORN_WORKERS': '4'})
+    runpy.run_path(os.path.join(ROOT, 'gunicorn.conf.py'))
+    assert os.environ['RESULT_CACHE_BACKEND'] == 'sqlite'
+
+    monkeypatch.setattr(os, 'environ', {'GUNICORN_WORKERS': '1'})
+    runpy.run_path(os.path.join(ROOT, 'gunicorn.conf.py'))
+    assert 'RESULT_CACHE_BACKEND' not in os.environ
+
+    cache = create_cache({'RESULT_CACHE_BACKEND': 'sqlite', 'RESULT_CACHE_PATH': str(tmp_path / 'c.sqlite3')})
+    assert isinstance(cache.backend, SQLiteBackend)
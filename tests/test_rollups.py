@@ -0,0 +1,126 @@
+from datetime import date
+import pandas as pd
+import pytest
+from analytics import rollups
+from models import db, Category, MonthlyCategoryTotal, Transaction
+from transaction_writer import TransactionWriter
+
+
+def rollup_rows(user_id):
+    return sorted(
+        (row.category_id, row.year, row.month, row.type, round(row.total, 2), row.count)
+        for row in MonthlyCategoryTotal.query.filter_by(user_id=user_id)
+        if row.count
+    )
+
+
+def statement(*rows):
+    return pd.DataFrame({
+        'date': pd.to_datetime([row[0] for row in rows]),
+        'description': [row[1] for row in rows],
+        'amount': [row[2] for row in rows],
+        'type': [row[3] for row in rows]
+    })
+
+
+@pytest.fixture
+def category_ids(user):
+    return [c.id for c in Category.query.filter_by(is_default=True).order_by(Category.id)]
+
+
+def test_incremental_rollup_matches_rebuild(user, category_ids):
+    food, transport = category_ids[:2]
+    frame = statement(
+        ('2024-01-05', 'coffee', 4.5, 'debit'),
+        ('2024-01-05', 'coffee', 4.5, 'debit'),
+        ('2024-01-20', 'bus', 2.0, 'debit'),
+        ('2024-02-01', 'salary', 3000.0, 'credit'),
+    )
+    TransactionWriter(batch_size=3).write(user.id, frame, [food, food, transport, None])
+
+    txn = Transaction(user_id=user.id, category_id=food, date=date(2024, 2, 3),
+                      description='lunch', amount=12.0, type='debit')
+    db.session.add(txn)
+    rollups.record_added(txn)
+
+    bus = Transaction.query.filter_by(user_id=user.id, description='bus').one()
+    old_category_id, bus.category_id = bus.category_id, food
+    rollups.record_recategorized(bus, old_category_id)
+    db.session.commit()
+
+    incremental = rollup_rows(user.id)
+    rollups.rebuild(user.id)
+    assert incremental == rollup_rows(user.id)
+    assert (food, 2024, 1, 'debit', 11.0, 3) in incremental
+
+
+def test_rows_swallowed_by_the_unique_index_skip_the_rollup(user, category_ids, monkeypatch):
+    food = category_ids[0]
+    frame = statement(('2024-03-01', 'coffee', 4.5, 'debit'), ('2024-03-02', 'tea', 3.0, 'debit'))
+    TransactionWriter().write(user.id, frame.iloc[:1], [food])
+    db.session.commit()
+
+    # A concurrent import committed the coffee row after our duplicate check
+    monkeypatch.setattr(TransactionWriter, '_new_records', staticmethod(lambda user_id, batch: batch))
+    inserted, duplicates = TransactionWriter().write(user.id, frame, [food, food])
+    db.session.commit()
+
+    assert (inserted, duplicates) == (1, 1)
+    assert rollup_rows(user.id) == [(food, 2024, 3, 'debit', 7.5, 2)]
+
+
+def test_deleting_a_recategorized_category(app, user):
+    user_id = user.id
+    # Enforce foreign keys on every connection, as InnoDB would
+    db.event.listen(db.engine, 'connect', lambda conn, record: conn.execute('PRAGMA foreign_keys=ON'))
+    db.session.remove()
+    db.engine.dispose()
+
+    old = Category(name='Snacks', user_id=user_id, color='#000000', icon='cookie')
+    new = Category(name='Treats', user_id=user_id, color='#ffffff', icon='gift')
+    db.session.add_all([old, new])
+    db.session.commit()
+    old_id, new_id = old.id, new.id
+
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = str(user_id)
+    client.post('/add-transaction', data={
+        'description': 'crisps', 'amount': '2.5', 'date': '2024-05-04', 'category_id': old_id
+    })
+    txn = Transaction.query.filter_by(user_id=user_id, description='crisps').one()
+    response = client.post('/update-transaction-category', json={
+        'transaction_id': txn.id, 'new_category_id': new_id
+    })
+    assert response.get_json()['success']
+
+    response = client.post(f'/categories/{old_id}', data={'_method': 'DELETE'})
+    assert response.status_code == 302
+    db.session.remove()
+    assert db.session.get(Category, old_id) is None
+    assert rollup_rows(user_id) == [(new_id, 2024, 5, 'debit', 2.5, 1)]
+    assert MonthlyCategoryTotal.query.filter_by(category_id=old_id).count() == 0
+
+
+def test_first_start_backfills_an_existing_database(app, user, category_ids):
+    from app import init_database
+
+    # Transactions written before the rollup existed
+    db.session.add_all([
+        Transaction(user_id=user.id, category_id=category_ids[0], date=date(2023, 12, 30),
+                    description='dinner', amount=40.0, type='debit'),
+        Transaction(user_id=user.id, category_id=category_ids[0], date=date(2024, 1, 2),
+                    description='lunch', amount=12.0, type='debit'),
+    ])
+    db.session.commit()
+    assert rollup_rows(user.id) == []
+
+    init_database()
+    assert rollup_rows(user.id) == [
+        (category_ids[0], 2023, 12, 'debit', 40.0, 1),
+        (category_ids[0], 2024, 1, 'debit', 12.0, 1),
+    ]
+    assert rollups.month_total(user.id, 2023, 12) == 40.0
+
+    # Only an empty rollup is backfilled
+    assert rollups.backfill() is None
@@ -0,0 +1,49 @@
+from datetime import date
+import pandas as pd
+from models import Transaction
+from parsers.bank_parser import BankStatementParser
+from parsers.statement_normalizer import StatementNormalizer
+from transaction_processor import TransactionProcessor
+
+# mm/dd: the first row can only be read month-first, the rest are ambiguous
+AMBIGUOUS_STATEMENT = """Date,Description,Credit,Debit
+01/15/2023,COFFEE SHOP,,500.00
+03/04/2023,UBER TRIP,,1200.00
+05/06/2023,PHARMACY,,800.00
+"""
+
+
+def test_date_format_is_detected_once_per_statement(tmp_path, user):
+    path = tmp_path / 'statement.csv'
+    path.write_text(AMBIGUOUS_STATEMENT)
+
+    TransactionProcessor().process_uploaded_file(user.id, str(path), 'csv', chunksize=1)
+
+    dates = {t.description: t.date for t in Transaction.query.filter_by(user_id=user.id)}
+    assert dates == {
+        'COFFEE SHOP': date(2023, 1, 15),
+        'UBER TRIP': date(2023, 3, 4),
+        'PHARMACY': date(2023, 5, 6)
+    }
+
+
+def test_normalize_uses_the_given_date_format():
+    raw = pd.DataFrame([['03/04/2023', 'UBER TRIP', '', '1200.00']])
+    normalizer = StatementNormalizer()
+
+    assert normalizer.normalize(raw)[0]['date'].iloc[0] == pd.Timestamp(2023, 4, 3)
+    assert normalizer.normalize(raw, '%m/%d/%Y')[0]['date'].iloc[0] == pd.Timestamp(2023, 3, 4)
+
+
+def test_count_rows_matches_iter_chunks_for_multiline_fields(tmp_path):
+    path = tmp_path / 'statement.csv'
+    path.write_text(
+        'Date,Description,Credit,Debit\n'
+        '15/01/2023,"COFFEE SHOP\nKINGSTON",,500.00\n'
+        '16/01/2023,"UBER\nTRIP\nTO WORK",,1200.00\n'
+        '17/01/2023,SALARY,150000.00,\n'
+    )
+    parser = BankStatementParser()
+
+    assert parser.count_rows(str(path), 'csv') == 3
+    assert sum(len(chunk) for chunk in parser.iter_chunks(str(path), 'csv', chunksize=2)) == 3
@@ -0,0 +1,80 @@
+import argparse
+import os
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import SGDClassifier
+from ml.predictor import CategoryPredictor
+from ml.streaming import StreamingTrainer, holdout_mask
+import model as train_script
+
+MERCHANTS = {
+    'Food & Dining': ['kfc new kingston', 'juici patties', 'coffee shop'],
+    'Transportation': ['uber trip', 'texaco fuel', 'knutsford express'],
+    'Salary': ['payroll acme ltd', 'salary deposit'],
+}
+
+
+def write_dataset(path, rows=600, seed=0):
+    rng = np.random.default_rng(seed)
+    categories = rng.choice(list(MERCHANTS), rows)
+    pd.DataFrame({
+        'Description': [rng.choice(MERCHANTS[c]).upper() for c in categories],
+        'Amount': [f"J${rng.uniform(100, 5000):,.2f}" for _ in categories],
+        'Type': ['CREDIT' if c == 'Salary' else 'DEBIT' for c in categories],
+        'Category': categories
+    }).to_csv(path, index=False)
+    return str(path)
+
+
+def stream_args(data, **overrides):
+    args = dict(data=data, chunksize=100, epochs=2, holdout_permille=100,
+                checkpoint='sgd_stream.checkpoint', checkpoint_every=1, n_jobs=None,
+                resume=False, report=False, report_path='model_report.json')
+    args.update(overrides)
+    return argparse.Namespace(**args)
+
+
+def test_streamed_model_is_served_with_its_own_encoder(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    data = write_dataset(tmp_path / 'data.csv')
+    train_script.train_streaming(stream_args(data))
+
+    # The shared encoder the other backends were trained with is left alone
+    assert not os.path.exists('label_encoder.pkl')
+    assert os.path.getsize('transaction_classifier_sgd_stream.pkl') < 2 * 1024 * 1024
+
+    predictor = CategoryPredictor(backend='sgd_stream')
+    predicted = predictor.label_encoder.inverse_transform(predictor.model.predict(pd.DataFrame({
+        'Description': ['kfc new kingston', 'uber trip'], 'Amount': [1500.0, 900.0], 'Type': ['DEBIT', 'DEBIT']
+    })))
+    assert list(predicted) == ['Food & Dining', 'Transportation']
+
+
+def test_resume_after_an_interruption_trains_every_row_once(tmp_path, monkeypatch):
+    data = write_dataset(tmp_path / 'data.csv')
+    checkpoint = str(tmp_path / 'sgd_stream.checkpoint')
+    trainer = StreamingTrainer(data, chunksize=100, epochs=1, holdout_permille=100,
+                               checkpoint_path=checkpoint, checkpoint_every=1)
+
+    original = SGDClassifier.partial_fit
+    calls = []
+
+    def interrupted_partial_fit(self, *args, **kwargs):
+        calls.append(1)
+        if len(calls) == 4:
+            raise KeyboardInterrupt()
+        return original(self, *args, **kwargs)
+
+    monkeypatch.setattr(SGDClassifier, 'partial_fit', interrupted_partial_fit)
+    with pytest.raises(KeyboardInterrupt):
+        trainer.run()
+    assert joblib.load(checkpoint)['rows_done'] == 300
+
+    monkeypatch.setattr(SGDClassifier, 'partial_fit', original)
+    trainer.run(resume=True)
+
+    state = joblib.load(checkpoint)
+    training_rows = int((~holdout_mask(np.arange(600), 100)).sum())
+    assert (state['epoch'], state['rows_done'], state['rows_trained']) == (1, 0, training_rows)
@@ -0,0 +1,96 @@
+from datetime import date, timedelta
+import pytest
+from models import db, Category, Transaction
+from transaction_pages import (
+    InvalidCursor, MAX_PAGE_SIZE, encode_cursor, fetch_page, filtered_transactions, page_size
+)
+
+
+def add_transactions(user, days, description='coffee shop'):
+    category = Category.query.filter_by(is_default=True).first()
+    for day in days:
+        db.session.add(Transaction(user_id=user.id, category_id=category.id, date=day,
+                                   description=description, amount=5.0, type='debit'))
+    db.session.commit()
+
+
+def all_pages(user, limit, **filters):
+    pages, cursor = [], None
+    while True:
+        query, relevance = filtered_transactions(user.id, **filters)
+        rows, cursor = fetch_page(query, cursor, limit, relevance)
+        pages.append([t.id for t in rows])
+        if cursor is None:
+            return pages
+
+
+def newest_first(user):
+    return [t.id for t in Transaction.query.filter_by(user_id=user.id).order_by(
+        Transaction.date.desc(), Transaction.id.desc())]
+
+
+def test_pages_cover_every_row_once_across_date_ties(user):
+    # Several transactions per day, so page boundaries fall inside a date
+    add_transactions(user, [date(2024, 1, 1 + i // 4) for i in range(11)])
+
+    pages = all_pages(user, limit=3)
+
+    assert [len(page) for page in pages] == [3, 3, 3, 2]
+    assert [txn_id for page in pages for txn_id in page] == newest_first(user)
+
+
+def test_exact_multiple_ends_without_an_empty_page(user):
+    add_transactions(user, [date(2024, 1, 1)] * 6)
+    assert [len(page) for page in all_pages(user, limit=3)] == [3, 3]
+
+
+def test_empty_result_has_no_cursor(user):
+    query, _ = filtered_transactions(user.id)
+    assert fetch_page(query, None, 10) == ([], None)
+
+
+def test_new_rows_do_not_shift_later_pages(user):
+    add_transactions(user, [date(2024, 1, 1) + timedelta(days=i) for i in range(6)])
+    expected = newest_first(user)
+
+    query, _ = filtered_transactions(user.id)
+    first, cursor = fetch_page(query, None, 3)
+    add_transactions(user, [date(2024, 2, 1)])
+    second, _ = fetch_page(filtered_transactions(user.id)[0], cursor, 3)
+
+    assert [t.id for t in first + second] == expected
+
+
+def test_cursor_past_the_last_row_returns_nothing(user):
+    add_transactions(user, [date(2024, 1, 1)])
+    oldest = Transaction.query.filter_by(user_id=user.id).one()
+
+    rows, cursor = fetch_page(filtered_transactions(user.id)[0], encode_cursor(oldest), 5)
+    assert (rows, cursor) == ([], None)
+
+
+def test_search_results_page_by_offset(user):
+    add_transactions(user, [date(2024, 1, i) for i in range(1, 6)], description='kfc new kingston')
+    add_transactions(user, [date(2024, 1, 1)], description='uber trip')
+
+    pages = all_pages(user, limit=2, search='kfc')
+    assert [len(page) for page in pages] == [2, 2, 1]
+    assert len({txn_id for page in pages for txn_id in page}) == 5
+
+
+def test_invalid_cursors_are_rejected(app, user):
+    query, _ = filtered_transactions(user.id)
+    with pytest.raises(InvalidCursor):
+        fetch_page(query, 'not-a-cursor', 10)
+
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = str(user.id)
+    response = client.get('/api/transactions?cursor=%%%')
+    assert response.status_code == 400
+
+
+def test_page_size_is_clamped():
+    assert page_size('0') == 1
+    assert page_size('10000') == MAX_PAGE_SIZE
+    assert page_size('abc', default=25) == 25
@@ -0,0 +1,21 @@
+import transaction_search
+from models import db
+
+
+def test_losing_the_index_build_race_still_uses_the_index(app, monkeypatch):
+    # app's init_database already built the FTS table; this worker checked
+    # before that and so runs the DDL again
+    real_check = transaction_search._index_exists
+    checks = []
+
+    def index_exists(conn, dialect):
+        checks.append(dialect)
+        return len(checks) > 1 and real_check(conn, dialect)
+
+    monkeypatch.setattr(transaction_search, '_index_exists', index_exists)
+    monkeypatch.setattr(transaction_search, '_ready', set())
+
+    transaction_search.install(db.engine)
+
+    assert checks == ['sqlite', 'sqlite']
+    assert 'sqlite' in transaction_search._ready
@@ -0,0 +1,134 @@
+import base64
+from datetime import date
+from sqlalchemy import and_, func, or_
+from sqlalchemy.orm import joinedload
+from models import db, Transaction
+from analytics.dates import in_month_of_any_year
+from transaction_search import apply_search
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def page_size(value, default=DEFAULT_PAGE_SIZE):
+    """Clamp a requested page size to 1..MAX_PAGE_SIZE"""
+    try:
+        size = int(value)
+    except (TypeError, ValueError):
+        return default
+    return max(1, min(size, MAX_PAGE_SIZE))
+
+
+def _encode(raw):
+    return base64.urlsafe_b64encode(raw.encode('ascii')).decode('ascii').rstrip('=')
+
+
+def _decode(token):
+    padded = token + '=' * (-len(token) % 4)
+    return base64.urlsafe_b64decode(padded.encode('ascii')).decode('ascii')
+
+
+def encode_cursor(transaction):
+    """Opaque token pointing just after this transaction in (date, id) desc order"""
+    return _encode(f"{transaction.date.isoformat()}|{transaction.id}")
+
+
+def decode_cursor(token):
+    try:
+        day, txn_id = _decode(token).split('|')
+        return date.fromisoformat(day), int(txn_id)
+    except Exception:
+        raise InvalidCursor(f"Invalid cursor: {token!r}")
+
+
+def encode_offset_cursor(offset):
+    return _encode(f"@{offset}")
+
+
+def decode_offset_cursor(token):
+    try:
+        raw = _decode(token)
+        if not raw.startswith('@'):
+            raise ValueError(raw)
+        return max(0, int(raw[1:]))
+    except Exception:
+        raise InvalidCursor(f"Invalid cursor: {token!r}")
+
+
+def filtered_transactions(user_id, category_id=None, month=None, search=None):
+    """The user's transactions narrowed by the /transactions filters (unordered).
+
+    Returns (query, relevance); relevance is the full-text score of the
+    search, or None when there is no search or no text index.
+    """
+    query = Transaction.query.filter_by(user_id=user_id)
+
+    if category_id and str(category_id).isdigit():
+        query = query.filter_by(category_id=int(category_id))
+
+    # One date range per year the user has data for, so the (user_id, date)
+    # index can serve it
+    if month and str(month).isdigit() and 1 <= int(month) <= 12:
+        first_date, last_date = db.session.query(
+            func.min(Transaction.date),
+            func.max(Transaction.date)
+        ).filter(Transaction.user_id == user_id).one()
+        if first_date and last_date:
+            query = query.filter(in_month_of_any_year(
+                Transaction.date, int(month), first_date.year, last_date.year
+            ))
+
+    relevance = None
+    if search:
+        query, relevance = apply_search(query, search, db.engine.dialect.name)
+
+    return query, relevance
+
+
+def fetch_page(query, cursor=None, limit=DEFAULT_PAGE_SIZE, relevance=None):
+    """One page of a transaction query, newest first.
+
+    Seeks past the cursor on (date, id) instead of using OFFSET, so every
+    page costs the same no matter how deep it is; the (user_id, date)
+    indexes already carry the primary key as their last column. Returns
+    (transactions, next_cursor), next_cursor being None on the last page.
+
+    With a relevance expression the page is ordered best match first and
+    the cursor is a plain offset: search results are small, and the score
+    is not a stable key to seek on.
+    """
+    if relevance is not None:
+        return _fetch_ranked_page(query, cursor, limit, relevance)
+
+    if cursor:
+        after_date, after_id = decode_cursor(cursor)
+        query = query.filter(or_(
+            Transaction.date < after_date,
+            and_(Transaction.date == after_date, Transaction.id < after_id)
+        ))
+
+    rows = query.options(joinedload(Transaction.category)).order_by(
+        Transaction.date.desc(),
+        Transaction.id.desc()
+    ).limit(limit + 1).all()
+
+    if len(rows) > limit:
+        return rows[:limit], encode_cursor(rows[limit - 1])
+    return rows, None
+
+
+def _fetch_ranked_page(query, cursor, limit, relevance):
+    offset = decode_offset_cursor(cursor) if cursor else 0
+    rows = query.options(joinedload(Transaction.category)).order_by(
+        relevance.desc(),
+        Transaction.date.desc(),
+        Transaction.id.desc()
+    ).offset(offset).limit(limit + 1).all()
+
+    if len(rows) > limit:
+        return rows[:limit], encode_offset_cursor(offset + limit)
+    return rows, None
@@ -1,103 +1,79 @@
-from datetime import datetime
-from models import db, Transaction
+from models import db
 from ml.predictor import CategoryPredictor
 from parsers.bank_parser import BankStatementParser
-import re
+from parsers.statement_normalizer import StatementNormalizer
+from transaction_writer import TransactionWriter, DEFAULT_BATCH_SIZE
+
+# Rows read, classified and committed per step of a streaming import
+DEFAULT_CHUNKSIZE = 5000
+# Rows from the top of a statement its date format is detected from
+DATE_SAMPLE_ROWS = 1000
 
 class TransactionProcessor:
-    def __init__(self):
+    def __init__(self, model_path=None, encoder_path=None, backend=None):
+        """model_path, encoder_path and backend are passed on to CategoryPredictor"""
         self.parser = BankStatementParser()
-        self.predictor = CategoryPredictor()
-
-    def process_uploaded_file(self, user_id, file_path, file_type):
+        self.predictor = CategoryPredictor(model_path, encoder_path, backend)
+        self.normalizer = StatementNormalizer()
+
+    def process_uploaded_file(self, user_id, file_path, file_type, progress_callback=None,
+                              chunksize=DEFAULT_CHUNKSIZE, start_row=0,
+                              batch_size=DEFAULT_BATCH_SIZE):
+        """Parse, classify and save a statement; returns the number of transactions saved.
+
+        The file is streamed in chunks of chunksize rows and each chunk is
+        committed on its own, so memory stays flat however long the file is.
+        start_row skips rows a previous, interrupted run already committed.
+        Rows are written through TransactionWriter in batch_size batches;
+        rows already imported from an earlier statement are skipped.
+
+        progress_callback, if given, is called with keyword arguments named
+        after the ImportJob progress columns. The per-chunk call happens
+        before that chunk's commit, so recorded progress and saved rows
+        always move together.
+        """
+        report = progress_callback or (lambda **fields: None)
         try:
-            raw_df = self.parser.parse_file(file_path, file_type)
-            print(f"📊 Parsed {len(raw_df)} rows from file")
-
-            transactions = []
+            report(stage='parsing')
+            total_rows = self.parser.count_rows(file_path, file_type)
+            report(stage='classifying', total_rows=total_rows)
+
+            # One category index and one writer for the whole file, shared by every chunk
+            category_index = self.predictor.build_category_index(user_id)
+            writer = TransactionWriter(batch_size=batch_size)
+            # Detected once, from the start of the file, so an ambiguous
+            # dd/mm vs mm/dd statement reads every chunk (and every resumed
+            # run) the same way
+            date_format = self._detect_date_format(file_path, file_type)
+            if start_row:
+                # Replay the rows an earlier run committed, normalize only,
+                # so repeated rows after start_row keep their occurrence numbers
+                for raw_chunk in self.parser.iter_chunks(file_path, file_type, chunksize, stop_row=start_row):
+                    rows, _ = self.normalizer.normalize(raw_chunk, date_format)
+                    writer.count_written(rows)
+
+            processed_rows = start_row
+            saved_count = 0
             skipped_count = 0
-            
-            for idx, row in raw_df.iterrows():
-                if len(row) < 4:
-                    skipped_count += 1
-                    continue
-
-                # Get raw values
-                date_raw = str(row[0]).strip()
-                description_raw = str(row[1]).strip()
-                credit_str = str(row[2]).strip() if len(row) > 2 else ''
-                debit_str = str(row[3]).strip() if len(row) > 3 else ''
-
-                print(f"🔍 Row {idx}: Date='{date_raw}', Desc='{description_raw[:30]}...', Credit='{credit_str}', Debit='{debit_str}'")
-
-                # Parse amounts - handle both string and float inputs
-                credit_amount = self._parse_amount(credit_str)
-                debit_amount = self._parse_amount(debit_str)
-
-                # Skip if no valid amount
-                if credit_amount is None and debit_amount is None:
-                    print(f"⚠️ Skipping row {idx}: No valid amount")
-                    skipped_count += 1
-                    continue
-
-                # Determine amount and type
-                if debit_amount is not None and debit_amount != 0:
-                    amount = abs(debit_amount)  # Make sure it's positive
-                    txn_type = 'debit'
-                elif credit_amount is not None and credit_amount != 0:
-                    amount = abs(credit_amount)  # Make sure it's positive
-                    txn_type = 'credit'
-                else:
-                    print(f"⚠️ Skipping row {idx}: Zero amount")
-                    skipped_count += 1
-                    continue
-
-                # Skip if description is empty or invalid
-                if not description_raw or description_raw.lower() in ['nan', 'none', '']:
-                    print(f"⚠️ Skipping row {idx}: Empty description")
-                    skipped_count += 1
-                    continue
-
-                # Parse date with better error handling
-                date_obj = self._parse_date(date_raw)
-                if date_obj is None:
-                    print(f"⚠️ Skipping row {idx}: Could not parse date '{date_raw}'")
-                    skipped_count += 1
-                    continue
-
-                # Predict category
-                print(f"🤖 Predicting category for: '{description_raw}' (${amount}, {txn_type})")
-                category_id = self.predictor.predict_for_user(
-                    user_id=user_id,
-                    description=description_raw,
-                    amount=amount,
-                    is_income=(txn_type == 'credit')
+            for raw_chunk in self.parser.iter_chunks(file_path, file_type, chunksize, start_row):
+                saved, skipped = self._process_chunk(user_id, raw_chunk, category_index, writer, date_format)
+                processed_rows += len(raw_chunk)
+                saved_count += saved
+                skipped_count += skipped
+
+                report(
+                    processed_rows=processed_rows,
+                    imported_count=saved_count,
+                    skipped_count=skipped_count,
+                    duplicate_count=writer.duplicates_skipped
                 )
-
-                if category_id is None:
-                    print(f"⚠️ Skipping row {idx}: Could not determine category")
-                    skipped_count += 1
-                    continue
-
-                # Create transaction object
-                transaction = Transaction(
-                    user_id=user_id,
-                    category_id=category_id,
-                    date=date_obj,
-                    description=description_raw,
-                    amount=amount,
-                    type=txn_type
-                )
-                transactions.append(transaction)
-                print(f"✅ Created transaction: {description_raw[:30]}... on {date_obj}")
-
-            if transactions:
-                db.session.add_all(transactions)
                 db.session.commit()
-                print(f"✅ Successfully saved {len(transactions)} transactions")
-            
-            print(f"📈 Processing summary: {len(transactions)} saved, {skipped_count} skipped")
-            return len(transactions)
+                print(f"💾 Committed rows up to {processed_rows} of {total_rows}")
+
+            print(f"📈 Processing summary: {saved_count} saved, {skipped_count} skipped, "
+                  f"{writer.duplicates_skipped} duplicates, "
+                  f"{writer.rows_per_second:,.0f} rows/sec inserted")
+            return saved_count
 
         except Exception as e:
             db.session.rollback()
@@ -106,109 +82,33 @@ class TransactionProcessor:
             traceback.print_exc()
             raise
 
-    def _parse_date(self, date_str):
-        """Improved date parsing for Jamaican bank formats"""
-        if not date_str or str(date_str).lower() in ['nan', 'none', '']:
-            return None
-            
-        date_str = str(date_str).strip()
-        print(f"🗓️ Parsing date: '{date_str}'")
-
-        # Remove extra whitespace and normalize
-        date_str = re.sub(r'\s+', ' ', date_str)
-
-        # Try common Jamaican bank formats
-        formats = [
-            '%d%b',             # 07APR (new format)
-            '%d-%b-%y',      # 15-Jan-23
-            '%d-%b-%Y',      # 15-Jan-2023  
-            '%d %b %Y',      # 15 Jan 2023
-            '%d %b %y',      # 15 Jan 23
-            '%d/%m/%Y',      # 15/01/2023
-            '%d/%m/%y',      # 15/01/23
-            '%Y-%m-%d',      # 2023-01-15
-            '%m/%d/%Y',      # 01/15/2023
-            '%m/%d/%y',      # 01/15/23
-            '%b %d, %Y',     # Jan 15, 2023
-            '%d-%m-%Y',      # 15-01-2023
-            '%d-%m-%y',      # 15-01-23
-        ]
-
-        for fmt in formats:
-            try:
-                parsed_date = datetime.strptime(date_str, fmt).date()
-                if fmt == '%d%b':
-                    parsed_date = parsed_date.replace(year=datetime.now().year)
-                print(f"✅ Successfully parsed '{date_str}' as {parsed_date} using format '{fmt}'")
-                return parsed_date
-            except ValueError:
-                continue
-
-        # Try with regex for mixed formats
-        # Pattern: DD-MMM-YY or DD MMM YYYY etc
-        month_map = {
-            'jan': '01', 'feb': '02', 'mar': '03', 'apr': '04',
-            'may': '05', 'jun': '06', 'jul': '07', 'aug': '08',
-            'sep': '09', 'oct': '10', 'nov': '11', 'dec': '12'
-        }
-        
-        # Try to extract day, month, year with regex
-        pattern = r'(\d{1,2})[-\s/]([a-zA-Z]{3}|\d{1,2})[-\s/](\d{2,4})'
-        match = re.search(pattern, date_str.lower())
-        
-        if match:
-            day, month, year = match.groups()
-            
-            # Convert month name to number if needed
-            if month.isalpha() and month.lower() in month_map:
-                month = month_map[month.lower()]
-            
-            # Convert 2-digit year to 4-digit
-            if len(year) == 2:
-                year_int = int(year)
-                if year_int > 50:  # Assume 1950-1999
-                    year = f"19{year}"
-                else:  # Assume 2000-2049
-                    year = f"20{year}"
-            
-            try:
-                parsed_date = datetime(int(year), int(month), int(day)).date()
-                print(f"✅ Successfully parsed '{date_str}' as {parsed_date} using regex")
-                return parsed_date
-            except ValueError:
-                pass
-
-        print(f"❌ Could not parse date: '{date_str}'")
+    def _detect_date_format(self, file_path, file_type):
+        for raw_chunk in self.parser.iter_chunks(file_path, file_type, DATE_SAMPLE_ROWS, stop_row=DATE_SAMPLE_ROWS):
+            return self.normalizer.detect_date_format(raw_chunk)
         return None
 
-    def _parse_amount(self, amount_str):
-        """Parse amount handling both Jamaican format and plain numbers"""
-        if not amount_str or str(amount_str).strip() in ['', 'nan', 'None', '0.0', '0']:
-            return None
-            
-        try:
-            # If it's already a float, use it
-            if isinstance(amount_str, (int, float)):
-                return float(amount_str) if amount_str != 0 else None
-                
-            # Clean string format
-            clean_str = str(amount_str).strip()
-            
-            # Handle Jamaican format: J$1,234.56 or negative amounts
-            clean_str = clean_str.replace('J$', '').replace(',', '')
-            
-            # Check for negative
-            is_negative = '-' in clean_str or '(' in clean_str
-            
-            # Remove all non-numeric except decimal point
-            clean_str = re.sub(r'[^\d\.]', '', clean_str)
-            
-            if not clean_str:
-                return None
-                
-            amount = float(clean_str)
-            return -amount if is_negative else amount
-            
-        except (ValueError, TypeError):
-            print(f"⚠️ Could not parse amount: '{amount_str}'")
-            return None
\ No newline at end of file
+    def _process_chunk(self, user_id, raw_df, category_index, writer, date_format=None):
+        """Normalize, classify and stage one chunk; returns (saved, skipped) counts"""
+        # Clean amounts, types, descriptions and dates column by column
+        rows, skipped = self.normalizer.normalize(raw_df, date_format)
+        skipped_count = len(skipped)
+        for reason, count in skipped['reason'].value_counts().items():
+            print(f"⚠️ Skipped {count} rows: {reason}")
+
+        # Predict categories for the whole chunk in one pass
+        category_ids = self.predictor.predict_batch(
+            user_id=user_id,
+            descriptions=rows['description'],
+            amounts=rows['amount'],
+            types=rows['type'],
+            category_index=category_index
+        )
+
+        missing = sum(1 for category_id in category_ids if category_id is None)
+        if missing:
+            print(f"⚠️ Skipped {missing} rows: Could not determine category")
+
+        saved, duplicates = writer.write(user_id, rows, category_ids)
+        if duplicates:
+            print(f"♻️ Skipped {duplicates} rows already imported")
+        return saved, skipped_count + missing
@@ -0,0 +1,129 @@
+import re
+from sqlalchemy import column, func, literal_column, table, text
+from models import Transaction
+
+# MySQL: a FULLTEXT index on transactions.description.
+# SQLite: an external-content FTS5 table kept in step by triggers, so the
+# bulk Core inserts used by imports are indexed too.
+FULLTEXT_INDEX = 'ft_transactions_description'
+FTS_TABLE = 'transactions_fts'
+
+# InnoDB skips tokens shorter than innodb_ft_min_token_size and its default
+# stopwords; those terms are matched with LIKE instead
+MYSQL_MIN_TOKEN_SIZE = 3
+MYSQL_STOPWORDS = {
+    'a', 'about', 'an', 'are', 'as', 'at', 'be', 'by', 'com', 'de', 'en',
+    'for', 'from', 'how', 'i', 'in', 'is', 'it', 'la', 'of', 'on', 'or',
+    'that', 'the', 'this', 'to', 'was', 'what', 'when', 'where', 'who',
+    'will', 'with', 'und', 'www'
+}
+
+SQLITE_FTS_DDL = [
+    f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+    " description, content='transactions', content_rowid='id',"
+    " tokenize='unicode61 remove_diacritics 2')",
+    f"CREATE TRIGGER {FTS_TABLE}_ai AFTER INSERT ON transactions BEGIN"
+    f" INSERT INTO {FTS_TABLE}(rowid, description) VALUES (new.id, new.description);"
+    " END",
+    f"CREATE TRIGGER {FTS_TABLE}_ad AFTER DELETE ON transactions BEGIN"
+    f" INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, description) VALUES ('delete', old.id, old.description);"
+    " END",
+    f"CREATE TRIGGER {FTS_TABLE}_au AFTER UPDATE OF description ON transactions BEGIN"
+    f" INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, description) VALUES ('delete', old.id, old.description);"
+    f" INSERT INTO {FTS_TABLE}(rowid, description) VALUES (new.id, new.description);"
+    " END",
+    # Index rows that existed before the triggers did
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"
+]
+
+# Dialects whose text index exists in this process
+_ready = set()
+
+
+def _index_exists(conn, dialect):
+    if dialect == 'mysql':
+        return conn.execute(text(
+            "SELECT 1 FROM information_schema.statistics"
+            " WHERE table_schema = DATABASE() AND table_name = 'transactions'"
+            " AND index_name = :name LIMIT 1"
+        ), {'name': FULLTEXT_INDEX}).first() is not None
+    return conn.execute(text(
+        "SELECT 1 FROM sqlite_master WHERE name = :name"
+    ), {'name': FTS_TABLE}).first() is not None
+
+
+def install(engine):
+    """Create the text index for this database if it is missing"""
+    dialect = engine.dialect.name
+    if dialect not in ('mysql', 'sqlite'):
+        return
+    try:
+        with engine.begin() as conn:
+            if not _index_exists(conn, dialect):
+                if dialect == 'mysql':
+                    print("🔎 Building FULLTEXT index on transaction descriptions")
+                    conn.execute(text(
+                        f"ALTER TABLE transactions ADD FULLTEXT INDEX {FULLTEXT_INDEX} (description)"
+                    ))
+                else:
+                    print("🔎 Building FTS5 index on transaction descriptions")
+                    for statement in SQLITE_FTS_DDL:
+                        conn.execute(text(statement))
+        _ready.add(dialect)
+    except Exception as e:
+        # Another worker may have built the index between our check and
+        # our DDL; its duplicate-index error is not a reason to use LIKE
+        try:
+            with engine.connect() as conn:
+                if _index_exists(conn, dialect):
+                    _ready.add(dialect)
+                    return
+        except Exception:
+            pass
+        print(f"⚠️ Full-text index unavailable, search falls back to LIKE: {e}")
+
+
+def search_terms(search):
+    return re.findall(r'\w+', search.lower())
+
+
+def apply_search(query, search, dialect):
+    """Narrow a Transaction query to descriptions matching every search term.
+
+    Each term is a prefix match ("amaz" finds "AMAZON.COM"). Returns
+    (query, relevance) where relevance is a column expression, higher is
+    better, or None when the database has no text index.
+    """
+    terms = search_terms(search)
+    if not terms:
+        return query, None
+
+    if dialect == 'mysql' and dialect in _ready:
+        from sqlalchemy.dialects.mysql import match
+
+        indexed = [t for t in terms if len(t) >= MYSQL_MIN_TOKEN_SIZE and t not in MYSQL_STOPWORDS]
+        for term in terms:
+            if term not in indexed:
+                query = query.filter(Transaction.description.ilike(f'%{term}%'))
+        if not indexed:
+            return query, None
+
+        relevance = match(
+            Transaction.description,
+            against=' '.join(f'+{term}*' for term in indexed)
+        ).in_boolean_mode()
+        return query.filter(relevance > 0), relevance
+
+    if dialect == 'sqlite' and dialect in _ready:
+        fts = table(FTS_TABLE, column('rowid'))
+        query = query.join(fts, fts.c.rowid == Transaction.id).filter(
+            text(f'{FTS_TABLE} MATCH :fts_query').bindparams(
+                fts_query=' '.join(f'"{term}"*' for term in terms)
+            )
+        )
+        # bm25() is lower-is-better
+        return query, -func.bm25(literal_column(FTS_TABLE))
+
+    for term in terms:
+        query = query.filter(Transaction.description.ilike(f'%{term}%'))
+    return query, None
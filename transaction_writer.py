@@ -0,0 +1,180 @@
+import hashlib
+import re
+import time
+from collections import Counter
+from sqlalchemy import insert
+from models import db, Transaction
+from analytics import rollups
+
+# Rows per executemany round trip
+DEFAULT_BATCH_SIZE = 1000
+
+
+def normalize_description(description):
+    return re.sub(r'\s+', ' ', str(description)).strip().lower()
+
+
+def transaction_fingerprint(user_id, date, amount, txn_type, description, occurrence=0):
+    """Stable hash identifying an imported transaction.
+
+    occurrence numbers identical rows within one statement (two equal
+    coffees on the same day), so genuine repeats survive while a re-import
+    of the same statement maps onto the same fingerprints.
+    """
+    key = f"{user_id}|{date.isoformat()}|{float(amount):.2f}|{txn_type}|{normalize_description(description)}"
+    if occurrence:
+        key = f"{key}|{occurrence}"
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+
+class TransactionWriter:
+    """Bulk insert path for imported transactions.
+
+    Rows go straight from the normalized frame into Core insert()
+    executemany batches; no ORM Transaction objects are built, so there is
+    no unit-of-work or identity-map bookkeeping per row. Every row carries
+    a fingerprint, and rows whose fingerprint the user already has are
+    skipped by the database. The caller owns the commit.
+
+    Use one writer per imported file: it numbers repeated rows across all
+    of that file's chunks.
+    """
+
+    def __init__(self, batch_size=DEFAULT_BATCH_SIZE):
+        self.batch_size = max(1, batch_size)
+        self.rows_written = 0
+        self.duplicates_skipped = 0
+        self.seconds = 0.0
+        self._occurrences = Counter()
+
+    @property
+    def rows_per_second(self):
+        return self.rows_written / self.seconds if self.seconds else 0.0
+
+    def write(self, user_id, frame, category_ids):
+        """Insert the frame's rows with their category ids.
+
+        Rows without a category are dropped. Returns (inserted, duplicates).
+        """
+        records = []
+        for category_id, (date, description, amount, txn_type), occurrence in zip(
+            category_ids, self._rows(frame), self._number_occurrences(frame)
+        ):
+            if category_id is None:
+                continue
+
+            records.append({
+                'user_id': user_id,
+                'category_id': category_id,
+                'date': date,
+                'description': description,
+                'amount': amount,
+                'type': txn_type,
+                'fingerprint': transaction_fingerprint(
+                    user_id, date, amount, txn_type, description, occurrence
+                )
+            })
+        if not records:
+            return 0, 0
+
+        started = time.perf_counter()
+        statement = self._insert_ignoring_duplicates()
+        inserted = 0
+        for offset in range(0, len(records), self.batch_size):
+            batch = self._new_records(user_id, records[offset:offset + self.batch_size])
+            if batch:
+                stored = self._insert(user_id, statement, batch)
+                # Keep the monthly rollup in step with the rows actually
+                # stored, in the same transaction
+                rollups.apply_deltas(user_id, rollups.deltas_for_records(stored))
+                inserted += len(stored)
+        elapsed = time.perf_counter() - started
+
+        duplicates = len(records) - inserted
+        self.rows_written += inserted
+        self.duplicates_skipped += duplicates
+        self.seconds += elapsed
+        return inserted, duplicates
+
+    def count_written(self, frame):
+        """Number the rows a previous run of this file already wrote.
+
+        A resumed import replays the rows before its start row through here,
+        so repeats of them further down keep counting from the right
+        occurrence instead of restarting at 0 (and colliding).
+        """
+        self._number_occurrences(frame)
+
+    @staticmethod
+    def _rows(frame):
+        return zip(
+            frame['date'].dt.date.tolist(),
+            frame['description'].tolist(),
+            frame['amount'].tolist(),
+            frame['type'].tolist()
+        )
+
+    def _number_occurrences(self, frame):
+        """Occurrence of each row among identical rows of the file so far.
+
+        Every normalized row is counted, classified or not, so the numbering
+        depends only on the statement and can be rebuilt on resume.
+        """
+        occurrences = []
+        for date, description, amount, txn_type in self._rows(frame):
+            base = (date, round(amount, 2), txn_type, normalize_description(description))
+            occurrences.append(self._occurrences[base])
+            self._occurrences[base] += 1
+        return occurrences
+
+    @staticmethod
+    def _insert(user_id, statement, batch):
+        """Execute the insert; returns the records the database kept.
+
+        Rows a concurrent import wrote after _new_records checked are
+        swallowed by the unique index and must not reach the rollup.
+        """
+        if db.engine.dialect.insert_executemany_returning:
+            # SQLite / PostgreSQL / MariaDB: RETURNING lists only the rows inserted
+            result = db.session.execute(statement.returning(Transaction.fingerprint), batch)
+            kept = {fingerprint for (fingerprint,) in result}
+        else:
+            result = db.session.execute(statement, batch)
+            if result.rowcount == len(batch):
+                return batch
+            # MySQL: InnoDB's REPEATABLE READ snapshot was taken by the
+            # _new_records read, before the other import committed, so
+            # re-selecting sees only the rows this transaction inserted
+            kept = {
+                fingerprint for (fingerprint,) in db.session.query(Transaction.fingerprint).filter(
+                    Transaction.user_id == user_id,
+                    Transaction.fingerprint.in_([record['fingerprint'] for record in batch])
+                )
+            }
+        return [record for record in batch if record['fingerprint'] in kept]
+
+    @staticmethod
+    def _new_records(user_id, batch):
+        """Drop records whose fingerprint is already stored, using the unique index"""
+        fingerprints = [record['fingerprint'] for record in batch]
+        existing = {
+            fingerprint for (fingerprint,) in db.session.query(Transaction.fingerprint).filter(
+                Transaction.user_id == user_id,
+                Transaction.fingerprint.in_(fingerprints)
+            )
+        }
+        return [record for record in batch if record['fingerprint'] not in existing]
+
+    @staticmethod
+    def _insert_ignoring_duplicates():
+        """INSERT that lets the unique index swallow rows a concurrent import just wrote"""
+        table = Transaction.__table__
+        dialect = db.engine.dialect.name
+        if dialect == 'mysql':
+            return insert(table).prefix_with('IGNORE')
+        if dialect == 'sqlite':
+            return insert(table).prefix_with('OR IGNORE')
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert as pg_insert
+            return pg_insert(table).on_conflict_do_nothing(index_elements=['user_id', 'fingerprint'])
+        return insert(table)